@@ -3,12 +3,93 @@ Command sandbox - validates all LLM-generated commands for safety
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, NamedTuple, Optional, Tuple
+from ..config.defaults import ALLOWED_COMMANDS, BLOCKED_COMMANDS
 from ..models.commands import Command, CommandType, SpawnSquadCommand
-from ..models.world import WorldState
+from ..models.world import Group, WorldState
 
 logger = logging.getLogger('batcom.ai.sandbox')
 
+DEFAULT_MAP_BOUNDS = {'min_x': 0, 'min_y': 0, 'max_x': 40000, 'max_y': 40000}
+
+# Sides spawn_squad may target (must already be upper-case)
+_SPAWN_SIDES = frozenset(('EAST', 'WEST', 'RESISTANCE'))
+
+# deploy_asset side spelling -> canonical side. Covers the usual spellings so the
+# common case is one dict lookup with no upper-cased copy of the string.
+_DEPLOY_SIDES = {
+    'EAST': 'EAST', 'WEST': 'WEST', 'RESISTANCE': 'RESISTANCE', 'INDEPENDENT': 'INDEPENDENT',
+    'east': 'EAST', 'west': 'WEST', 'resistance': 'RESISTANCE', 'independent': 'INDEPENDENT',
+}
+
+
+class _Bounds(NamedTuple):
+    """Map bounds frozen at validator construction (tuple subclass, no per-instance __dict__)"""
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+
+
+def _skip_audit(action: str, command: Command, reason: str):
+    """Stand-in for CommandValidator._audit_log when audit logging is disabled"""
+
+
+def _to_command_types(names) -> FrozenSet[CommandType]:
+    """Map configured command names to CommandType members, skipping unknown names"""
+    types = set()
+    for name in names:
+        try:
+            types.add(CommandType(name))
+        except ValueError:
+            logger.warning("Ignoring unknown command type in sandbox config: %s", name)
+    return frozenset(types)
+
+
+_GROUP_ID_PARAMS = ('vehicle_group_id', 'passenger_group_id', 'escort_group_id', 'target_group_id')
+
+
+def _referenced_group_ids(command: Command) -> set:
+    """
+    Collect every group ID a command refers to (target group plus group params)
+
+    Non-string IDs (e.g. a list sent by the LLM) are skipped; they can't match a
+    group, and the command's own validator rejects them.
+    """
+    ids = set()
+    if isinstance(command.group_id, str):
+        ids.add(command.group_id)
+    params = command.params
+    for key in _GROUP_ID_PARAMS:
+        group_id = params.get(key)
+        if group_id and isinstance(group_id, str):
+            ids.add(group_id)
+    return ids
+
+
+def _lookup_group(groups: Dict[str, Group], group_id: Any) -> Optional[Group]:
+    """Look up a prefetched group; non-string IDs never match"""
+    return groups.get(group_id) if isinstance(group_id, str) else None
+
+
+def _position_param(params: Dict[str, Any]) -> tuple:
+    """Extract the single 'position' param of a command"""
+    return (params.get('position'),)
+
+
+# Per command type: the positions that must lie inside the map bounds.
+# Types without an entry (escort_group has no fixed position) are not checked.
+_POSITION_EXTRACTORS = {
+    CommandType.SPAWN_SQUAD: _position_param,
+    CommandType.MOVE_TO: _position_param,
+    CommandType.DEFEND_AREA: _position_param,
+    CommandType.SEEK_AND_DESTROY: _position_param,
+    CommandType.FIRE_SUPPORT: _position_param,
+    CommandType.DEPLOY_ASSET: _position_param,
+    CommandType.PATROL_ROUTE: lambda params: params.get('waypoints') or (),
+    CommandType.TRANSPORT_GROUP: lambda params: (params.get('pickup'), params.get('dropoff')),
+}
+
 
 class CommandValidator:
     """
@@ -26,14 +107,31 @@ class CommandValidator:
         """
         self.state = state_manager
         self.enabled = config.get('sandbox_enabled', True)
-        self.allowed_commands = set(config.get('allowed_commands', [
-            'move_to', 'defend_area', 'patrol_route', 'seek_and_destroy', 'spawn_squad',
-            'transport_group', 'escort_group', 'fire_support', 'deploy_asset'
-        ]))
-        self.blocked_commands = set(config.get('blocked_commands', []))
+        self.allowed_commands = set(config.get('allowed_commands', ALLOWED_COMMANDS))
+        self.blocked_commands = set(config.get('blocked_commands', BLOCKED_COMMANDS))
+        # Resolve the configured names to CommandType members once; unknown
+        # names can never match a parsed command so they are dropped here
+        self._allowed_types = _to_command_types(self.allowed_commands)
+        self._blocked_types = _to_command_types(self.blocked_commands)
         self.max_units_per_side = config.get('max_units_per_side', 100)
-        self.map_bounds = config.get('map_bounds', {'min_x': 0, 'min_y': 0, 'max_x': 40000, 'max_y': 40000})
+        self.map_bounds = config.get('map_bounds', DEFAULT_MAP_BOUNDS)
         self.audit_log_enabled = config.get('audit_log', True)
+        # Audit entries collected during validate_commands, emitted as one record
+        self._audit_buffer: List[tuple] = []
+
+        # Type-specific validators, all called as (command, world_state, groups)
+        self._type_validators = {
+            CommandType.SPAWN_SQUAD: self._validate_spawn_command,
+            CommandType.TRANSPORT_GROUP: self._validate_transport_command,
+            CommandType.ESCORT_GROUP: self._validate_escort_command,
+            CommandType.FIRE_SUPPORT: self._validate_fire_support_command,
+            CommandType.DEPLOY_ASSET: self._validate_deploy_asset_command,
+        }
+
+        # (side, asset_type) -> (defense_only, unit_classes), or None if no template.
+        # Flushed whenever the state manager's resource pool version changes.
+        self._template_cache: Dict[Tuple[str, str], Optional[Tuple[bool, tuple]]] = {}
+        self._template_cache_version = -1
 
         # Override map bounds with AO guardrails if provided by state
         if state_manager and getattr(state_manager, "ao_bounds", None):
@@ -47,6 +145,17 @@ class CommandValidator:
                     'max_y': ao.get('max_y')
                 }
 
+        # Bounds are fixed for the validator's lifetime - unpack them once so
+        # position checks compare against locals instead of re-indexing the dict
+        self._bounds = _Bounds(*(
+            self.map_bounds.get(k, DEFAULT_MAP_BOUNDS[k]) for k in _Bounds._fields
+        ))
+
+        # Audit logging is fixed for the validator's lifetime; when it is off,
+        # bind a no-op so validate_commands skips the per-command flag check
+        if not self.audit_log_enabled:
+            self._audit_log = _skip_audit
+
         logger.info("CommandValidator initialized (enabled: %s)", self.enabled)
 
     def validate_commands(
@@ -68,63 +177,104 @@ class CommandValidator:
             logger.warning("Sandbox validation is DISABLED - all commands pass through!")
             return commands
 
-        valid_commands = []
-
+        # Cheapest check first: drop disallowed/blocked command types in one pass
+        # so the group prefetch and deeper checks only see viable commands
+        allowed_types = self._allowed_types
+        blocked_types = self._blocked_types
+        candidates = []
+        rejected_types = set()
         for cmd in commands:
-            if self.is_safe(cmd, world_state):
-                valid_commands.append(cmd)
-                self._audit_log("ALLOWED", cmd, "Command passed validation")
+            if cmd.type in allowed_types and cmd.type not in blocked_types:
+                candidates.append(cmd)
             else:
-                self._audit_log("BLOCKED", cmd, "Command failed validation")
+                rejected_types.add(cmd.type.value)
+                self._audit_log("BLOCKED", cmd, "Command type not allowed")
+
+        if rejected_types:
+            logger.warning("Blocked %d command(s) with disallowed types: %s",
+                           len(commands) - len(candidates), ", ".join(sorted(rejected_types)))
+
+        valid_commands = []
+
+        try:
+            # Resolve every group the batch refers to in one pass over the world
+            group_ids = set()
+            for cmd in candidates:
+                group_ids.update(_referenced_group_ids(cmd))
+            groups = world_state.get_groups_by_ids(group_ids)
+
+            for cmd in candidates:
+                if self._passes_checks(cmd, world_state, groups):
+                    valid_commands.append(cmd)
+                    self._audit_log("ALLOWED", cmd, "Command passed validation")
+                else:
+                    self._audit_log("BLOCKED", cmd, "Command failed validation")
+        finally:
+            # Never carry audit entries over into the next batch
+            self._flush_audit_log()
 
         logger.info("Validated %d commands: %d allowed, %d blocked",
                    len(commands), len(valid_commands), len(commands) - len(valid_commands))
 
         return valid_commands
 
-    def is_safe(self, command: Command, world_state: WorldState) -> bool:
+    def is_safe(
+        self,
+        command: Command,
+        world_state: WorldState,
+        groups: Optional[Dict[str, Group]] = None
+    ) -> bool:
         """
         Check if a command is safe to execute
 
         Args:
             command: Command to validate
             world_state: Current world state
+            groups: Pre-resolved groups by ID (looked up from world_state if omitted)
 
         Returns:
             True if command is safe
         """
+        # Check 1: Command type in allowed list
+        if command.type not in self._allowed_types:
+            logger.warning("Command type '%s' not in allowed list", command.type.value)
+            return False
+
+        # Check 2: Command type not in blocked list
+        if command.type in self._blocked_types:
+            logger.warning("Command type '%s' is in blocked list", command.type.value)
+            return False
+
+        return self._passes_checks(command, world_state, groups)
+
+    def _passes_checks(
+        self,
+        command: Command,
+        world_state: WorldState,
+        groups: Optional[Dict[str, Group]] = None
+    ) -> bool:
+        """
+        Run the group, type-specific and position checks on a command whose
+        type has already been allowed
+
+        Args:
+            command: Command to validate
+            world_state: Current world state
+            groups: Pre-resolved groups by ID (looked up from world_state if omitted)
+
+        Returns:
+            True if command passes all checks
+        """
         try:
-            # Check 1: Command type in allowed list
-            if command.type.value not in self.allowed_commands:
-                logger.warning("Command type '%s' not in allowed list", command.type.value)
-                return False
+            if groups is None:
+                groups = world_state.get_groups_by_ids(_referenced_group_ids(command))
 
-            # Check 2: Command type not in blocked list
-            if command.type.value in self.blocked_commands:
-                logger.warning("Command type '%s' is in blocked list", command.type.value)
+            # Check 3: Type-specific validation (non-spawn commands without a
+            # dedicated validator only need their group to exist and be controlled)
+            validator = self._type_validators.get(command.type, self._validate_group_controlled)
+            if not validator(command, world_state, groups):
                 return False
 
-            # Check 3: Type-specific validation
-            if command.type == CommandType.SPAWN_SQUAD:
-                if not self._validate_spawn_command(command, world_state):
-                    return False
-            elif command.type == CommandType.TRANSPORT_GROUP:
-                if not self._validate_transport_command(command, world_state):
-                    return False
-            elif command.type == CommandType.ESCORT_GROUP:
-                if not self._validate_escort_command(command, world_state):
-                    return False
-            elif command.type == CommandType.FIRE_SUPPORT:
-                if not self._validate_fire_support_command(command, world_state):
-                    return False
-            elif command.type == CommandType.DEPLOY_ASSET:
-                if not self._validate_deploy_asset_command(command, world_state):
-                    return False
-            else:
-                # For non-spawn commands, validate group exists and is controlled
-                if not self._validate_group_controlled(command, world_state):
-                    return False
-
             # Check 4: Validate position bounds
             if not self._validate_position_bounds(command):
                 return False
@@ -135,18 +285,24 @@ class CommandValidator:
             logger.error("Exception during command validation: %s", e, exc_info=True)
             return False
 
-    def _validate_group_controlled(self, command: Command, world_state: WorldState) -> bool:
+    def _validate_group_controlled(
+        self,
+        command: Command,
+        world_state: WorldState,
+        groups: Dict[str, Group]
+    ) -> bool:
         """
         Validate that the target group exists and is controlled
 
         Args:
             command: Command to validate
             world_state: Current world state
+            groups: Groups referenced by the command, keyed by ID
 
         Returns:
             True if group is valid and controlled
         """
-        group = world_state.get_group_by_id(command.group_id)
+        group = _lookup_group(groups, command.group_id)
 
         if not group:
             # Allow pending spawns (group_id starts with SPAWN_ or DEPLOY_)
@@ -163,13 +319,19 @@ class CommandValidator:
 
         return True
 
-    def _validate_spawn_command(self, command: SpawnSquadCommand, world_state: WorldState) -> bool:
+    def _validate_spawn_command(
+        self,
+        command: SpawnSquadCommand,
+        world_state: WorldState,
+        groups: Dict[str, Group]
+    ) -> bool:
         """
         Validate spawn command
 
         Args:
             command: Spawn command to validate
             world_state: Current world state
+            groups: Groups referenced by the command, keyed by ID
 
         Returns:
             True if spawn is safe
@@ -178,7 +340,7 @@ class CommandValidator:
         unit_classes = command.params.get('unit_classes', [])
 
         # Validate side
-        if side not in ['EAST', 'WEST', 'RESISTANCE']:
+        if side not in _SPAWN_SIDES:
             logger.warning("Invalid side for spawn: %s", side)
             return False
 
@@ -192,7 +354,7 @@ class CommandValidator:
             return False
 
         # Check spawn limits per side
-        current_deployment = world_state.ai_deployment.get(side.upper(), 0)
+        current_deployment = world_state.ai_deployment.get(side, 0)
         if current_deployment + len(unit_classes) > self.max_units_per_side:
             logger.warning(
                 "Spawn would exceed max units for %s: %d + %d > %d",
@@ -202,13 +364,13 @@ class CommandValidator:
 
         return True
 
-    def _validate_transport_command(self, command: Command, world_state: WorldState) -> bool:
+    def _validate_transport_command(self, command: Command, world_state: WorldState, groups: Dict[str, Group]) -> bool:
         """Validate transport_group command"""
         vehicle_group_id = command.params.get('vehicle_group_id') or command.group_id
         passenger_group_id = command.params.get('passenger_group_id')
 
-        vehicle_group = world_state.get_group_by_id(vehicle_group_id)
-        passenger_group = world_state.get_group_by_id(passenger_group_id) if passenger_group_id else None
+        vehicle_group = _lookup_group(groups, vehicle_group_id)
+        passenger_group = _lookup_group(groups, passenger_group_id) if passenger_group_id else None
 
         if not vehicle_group or not passenger_group:
             logger.warning("Transport command groups not found (veh:%s, pax:%s)", vehicle_group_id, passenger_group_id)
@@ -225,13 +387,13 @@ class CommandValidator:
 
         return True
 
-    def _validate_escort_command(self, command: Command, world_state: WorldState) -> bool:
+    def _validate_escort_command(self, command: Command, world_state: WorldState, groups: Dict[str, Group]) -> bool:
         """Validate escort_group command"""
         escort_group_id = command.params.get('escort_group_id') or command.group_id
         target_group_id = command.params.get('target_group_id')
 
-        escort_group = world_state.get_group_by_id(escort_group_id)
-        target_group = world_state.get_group_by_id(target_group_id) if target_group_id else None
+        escort_group = _lookup_group(groups, escort_group_id)
+        target_group = _lookup_group(groups, target_group_id) if target_group_id else None
 
         if not escort_group or not target_group:
             logger.warning("Escort command groups not found (escort:%s, target:%s)", escort_group_id, target_group_id)
@@ -248,9 +410,9 @@ class CommandValidator:
 
         return True
 
-    def _validate_fire_support_command(self, command: Command, world_state: WorldState) -> bool:
+    def _validate_fire_support_command(self, command: Command, world_state: WorldState, groups: Dict[str, Group]) -> bool:
         """Validate fire_support command"""
-        group = world_state.get_group_by_id(command.group_id)
+        group = _lookup_group(groups, command.group_id)
 
         if not group or not group.is_controlled:
             logger.warning("Fire support group %s not found or not controlled", command.group_id)
@@ -263,29 +425,33 @@ class CommandValidator:
 
         return True
 
-    def _validate_deploy_asset_command(self, command: Command, world_state: WorldState) -> bool:
+    def _validate_deploy_asset_command(self, command: Command, world_state: WorldState, groups: Dict[str, Group]) -> bool:
         """Validate deploy_asset command (lightweight, resource pool checked elsewhere)"""
-        side = (command.params.get('side') or "").upper()
+        raw_side = command.params.get('side')
         asset_type = command.params.get('asset_type')
 
-        if side not in ['EAST', 'WEST', 'RESISTANCE', 'INDEPENDENT']:
-            logger.warning("deploy_asset invalid side: %s", side)
-            return False
+        side = _DEPLOY_SIDES.get(raw_side)
+        if side is None:
+            # Mixed-case spellings are still accepted via the slow path
+            side = (raw_side or "").upper()
+            if side not in _DEPLOY_SIDES:
+                logger.warning("deploy_asset invalid side: %s", side)
+                return False
 
         if not asset_type:
             logger.warning("deploy_asset missing asset_type")
             return False
 
         if self.state:
-            template = self.state.get_asset_template(side, asset_type)
-            if not template:
+            template_info = self._get_template_info(side, asset_type)
+            if template_info is None:
                 logger.warning("deploy_asset template not found for %s:%s", side, asset_type)
                 return False
 
             # Check defense_only constraint
             # Defense-only assets can ONLY be deployed during GLOBAL AO Defense Phase
             # (not for individual defend_hq, defend_radiotower objectives)
-            defense_only = template.get('defense_only', False)
+            defense_only, unit_classes = template_info
             if defense_only:
                 # Check if AO is in global defense phase (counterattack/defend AO scenario)
                 is_ao_defense_phase = self.state.is_ao_defense_phase() if self.state else False
@@ -301,9 +467,8 @@ class CommandValidator:
                     logger.info("deploy_asset %s:%s is defense_only and AO Defense Phase is ACTIVE - ALLOWED",
                                side, asset_type)
 
-            unit_classes = template.get('unit_classes', [])
             if unit_classes and not command.params.get('unit_classes'):
-                command.params['unit_classes'] = unit_classes
+                command.params['unit_classes'] = list(unit_classes)
             if not self.state.reserve_asset(side, asset_type):
                 logger.warning("deploy_asset exceeds pool for %s:%s", side, asset_type)
                 return False
@@ -315,6 +480,34 @@ class CommandValidator:
 
         return True
 
+    def _get_template_info(self, side: str, asset_type: str) -> Optional[Tuple[bool, tuple]]:
+        """
+        Get the validation-relevant fields of an asset template
+
+        Args:
+            side: Upper-case side name
+            asset_type: Asset type identifier
+
+        Returns:
+            (defense_only, unit_classes) tuple, or None if no template exists
+        """
+        version = self.state.resource_version
+        if version != self._template_cache_version:
+            self._template_cache.clear()
+            self._template_cache_version = version
+
+        key = (side, asset_type)
+        if key in self._template_cache:
+            return self._template_cache[key]
+
+        template = self.state.get_asset_template(side, asset_type)
+        if template:
+            info = (bool(template.get('defense_only', False)), tuple(template.get('unit_classes') or ()))
+        else:
+            info = None
+        self._template_cache[key] = info
+        return info
+
     def _validate_position_bounds(self, command: Command) -> bool:
         """
         Validate that all positions in command are within map bounds
@@ -325,25 +518,13 @@ class CommandValidator:
         Returns:
             True if all positions are valid
         """
-        positions = []
-
-        # Extract positions based on command type
-        if command.type == CommandType.SPAWN_SQUAD:
-            positions.append(command.params.get('position'))
-        elif command.type in [CommandType.MOVE_TO, CommandType.DEFEND_AREA, CommandType.SEEK_AND_DESTROY, CommandType.FIRE_SUPPORT]:
-            positions.append(command.params.get('position'))
-        elif command.type == CommandType.PATROL_ROUTE:
-            positions.extend(command.params.get('waypoints', []))
-        elif command.type == CommandType.TRANSPORT_GROUP:
-            positions.append(command.params.get('pickup'))
-            positions.append(command.params.get('dropoff'))
-        elif command.type == CommandType.ESCORT_GROUP:
-            # Escort has no fixed position; skip bounds check here
-            pass
-        elif command.type == CommandType.DEPLOY_ASSET:
-            positions.append(command.params.get('position'))
+        extract = _POSITION_EXTRACTORS.get(command.type)
+        if extract is None:
+            return True
+        positions = extract(command.params)
 
         # Validate each position
+        min_x, min_y, max_x, max_y = self._bounds
         for pos in positions:
             if not pos or len(pos) < 2:
                 logger.warning("Invalid position format")
@@ -351,14 +532,12 @@ class CommandValidator:
 
             x, y = pos[0], pos[1]
 
-            if not (self.map_bounds['min_x'] <= x <= self.map_bounds['max_x']):
-                logger.warning("Position X out of bounds: %f (bounds: %d-%d)",
-                             x, self.map_bounds['min_x'], self.map_bounds['max_x'])
+            if not (min_x <= x <= max_x):
+                logger.warning("Position X out of bounds: %f (bounds: %d-%d)", x, min_x, max_x)
                 return False
 
-            if not (self.map_bounds['min_y'] <= y <= self.map_bounds['max_y']):
-                logger.warning("Position Y out of bounds: %f (bounds: %d-%d)",
-                             y, self.map_bounds['min_y'], self.map_bounds['max_y'])
+            if not (min_y <= y <= max_y):
+                logger.warning("Position Y out of bounds: %f (bounds: %d-%d)", y, min_y, max_y)
                 return False
 
         return True
@@ -372,13 +551,17 @@ class CommandValidator:
             command: Command being validated
             reason: Reason for decision
         """
-        if not self.audit_log_enabled:
+        self._audit_buffer.append((action, command.type.value, command.group_id, reason))
+
+    def _flush_audit_log(self):
+        """Emit all buffered audit entries as a single log record"""
+        if not self._audit_buffer:
             return
 
-        logger.info(
-            "[AUDIT] %s: %s for group %s - %s",
-            action,
-            command.type.value,
-            command.group_id,
-            reason
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[AUDIT] %d command(s):\n%s",
+                len(self._audit_buffer),
+                "\n".join("  %s: %s for group %s - %s" % entry for entry in self._audit_buffer)
+            )
+        self._audit_buffer.clear()
@@ -8,32 +8,40 @@ BATCOM Python core. All functions in this module can be called from SQF using:
 
 """
 
+import importlib
 import logging
 import json
 import os
 import sys
+import threading
 
 # Early debug output for Pythia diagnostics
 print(f"[BATCOM.API] Module loading... Python {sys.version}", flush=True)
 
-# Import BATCOM modules with error handling for Linux compatibility
-try:
-    from .utils.logging_setup import setup_logging, get_logger
-    from .world.scanner import WorldScanner
-    from .commands.queue import CommandQueue
-    from .runtime.state import StateManager
-    from .runtime.admin import AdminCommandHandler
-    print("[BATCOM.API] All modules imported successfully", flush=True)
-except ImportError as e:
-    print(f"[BATCOM.API] CRITICAL: Failed to import modules: {e}", flush=True)
-    import traceback
-    traceback.print_exc()
-    raise
-except Exception as e:
-    print(f"[BATCOM.API] CRITICAL: Unexpected error during imports: {e}", flush=True)
-    import traceback
-    traceback.print_exc()
-    raise
+logger = logging.getLogger('batcom.api')
+
+# Subsystem classes are imported by init() rather than here, so loading this
+# module for is_initialized()/get_version() does not pull in the whole package.
+# Names that used to be module attributes still resolve through __getattr__.
+_LAZY_IMPORTS = {
+    'setup_logging': ('.utils.logging_setup', 'setup_logging'),
+    'get_logger': ('.utils.logging_setup', 'get_logger'),
+    'WorldScanner': ('.world.scanner', 'WorldScanner'),
+    'CommandQueue': ('.commands.queue', 'CommandQueue'),
+    'StateManager': ('.runtime.state', 'StateManager'),
+    'AdminCommandHandler': ('.runtime.admin', 'AdminCommandHandler'),
+}
+
+
+def __getattr__(name):
+    """Resolve lazily imported subsystem names (PEP 562)"""
+    target = _LAZY_IMPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(target[0], __package__), target[1])
+    globals()[name] = value
+    return value
+
 
 # Module-level state
 _logger = None
@@ -44,16 +52,48 @@ _world_scanner = None
 _command_queue = None
 _state_manager = None
 _admin_handler = None
+_commander_cls = None  # runtime.commander.batcom, imported by the first init()
+
+# Pre-converted Pythia results for the constant status replies. Pythia copies
+# returned lists into SQF arrays, so these are shared and must not be mutated.
+_OK_RESULT = [["status", "ok"]]
+_NOT_INITIALIZED_RESULT = [["status", "error"], ["error", "BATCOM not initialized"]]
+_NOT_INITIALIZED_SHUTDOWN_RESULT = [["status", "ok"], ["message", "BATCOM was not initialized"]]
+
 GUARDRAILS_PATH = os.path.join(os.path.dirname(__file__), "guardrails.json")
+_guardrails_cache = None  # ((path, mtime_ns), parsed dict) of the last read
+
+# Converted results for the polled resource pool endpoints, shared like the
+# constant replies above
+_resource_status_cache = None  # ((state manager, versions, ao_defense), result)
+_templates_cache = None  # (loader, result)
+
+
+def _get_commander_cls():
+    """Import the commander class on first use and keep it for later init() calls"""
+    global _commander_cls
+    if _commander_cls is None:
+        from .runtime.commander import batcom
+        _commander_cls = batcom
+    return _commander_cls
 
 
 def _load_guardrails():
-    """Load guardrails overrides from guardrails.json if present"""
+    """Load guardrails overrides from guardrails.json if present
+
+    The parsed file is cached against its path and mtime, so repeated init()
+    calls only re-read it after it has been rewritten (e.g. by the admin
+    handler persisting LLM config).
+    """
+    global _guardrails_cache
     try:
-        with open(GUARDRAILS_PATH, "r") as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return data
+        key = (GUARDRAILS_PATH, os.stat(GUARDRAILS_PATH).st_mtime_ns)
+        if _guardrails_cache is None or _guardrails_cache[0] != key:
+            with open(GUARDRAILS_PATH, "rb") as f:
+                data = json.loads(f.read())
+            _guardrails_cache = (key, data if isinstance(data, dict) else {})
+        # Shallow copy so callers can't mutate the cached top level
+        return dict(_guardrails_cache[1])
     except FileNotFoundError:
         return {}
     except Exception as e:
@@ -61,22 +101,35 @@ def _load_guardrails():
     return {}
 
 
+# Value types the Pythia converters pass through untouched
+_SCALAR_TYPES = frozenset((str, int, float, bool))
+
+
+def _is_pairs(arr):
+    """Return True if every element of arr is a [key, value] pair
+
+    Stops at the first non-pair so plain data lists are rejected after one
+    element instead of being scanned end to end.
+    """
+    for item in arr:
+        if not isinstance(item, (list, tuple)) or len(item) != 2:
+            return False
+    return True
+
+
 def _array_to_dict(arr):
     """Convert nested array from Pythia to dictionary"""
-    if not isinstance(arr, (list, tuple)):
+    # Scalars make up most leaves; settle them before the isinstance check
+    if type(arr) in _SCALAR_TYPES or not isinstance(arr, (list, tuple)):
         return arr
 
     # If this list looks like dict items (pairs), convert to dict
-    if all(isinstance(item, (list, tuple)) and len(item) == 2 for item in arr):
+    if _is_pairs(arr):
         result = {}
         for key, value in arr:
             if isinstance(value, (list, tuple)):
-                # If nested list is itself pairs, convert to dict
-                if all(isinstance(v, (list, tuple)) and len(v) == 2 for v in value):
-                    value = _array_to_dict(value)
-                else:
-                    # Recurse element-wise
-                    value = [_array_to_dict(v) for v in value]
+                # Nested pairs become a dict, anything else converts element-wise
+                value = _array_to_dict(value)
             result[key] = value
         return result
 
@@ -95,23 +148,96 @@ def _dict_to_array(d):
         return "" if d is None else d
 
     result = []
+    append = result.append
     for key, value in d.items():
+        # Most values are plain scalars; one exact type lookup settles them
+        if type(value) in _SCALAR_TYPES:
+            pass
         # Replace None with empty string to avoid nil on SQF side
-        if value is None:
+        elif value is None:
             value = ""
-
         # Recursively convert nested dicts
-        if isinstance(value, dict):
+        elif isinstance(value, dict):
             value = _dict_to_array(value)
         # Convert lists of dicts
         elif isinstance(value, (list, tuple)):
             value = [_dict_to_array(item) if isinstance(item, dict) else item for item in value]
 
-        result.append([key, value])
+        append([key, value])
 
     return result
 
 
+def _err(message):
+    """Build a Pythia error result without an intermediate dict"""
+    return [["status", "error"], ["error", message]]
+
+
+def _err_with_commands(message):
+    """Build a get_pending_commands error result with an empty command list"""
+    return [["status", "error"], ["error", message], ["commands", []]]
+
+
+def _open_init_debug(config_array):
+    """Open batcom_init_debug.txt and record the raw init() payload
+
+    Returns:
+        Open file handle, or None if the file could not be written
+    """
+    try:
+        f = open('batcom_init_debug.txt', 'w', buffering=8192)
+    except OSError:
+        return None
+    f.write("="*60 + "\n")
+    f.write("BATCOM Python init() called\n")
+    f.write("="*60 + "\n")
+    f.write(f"Python version: {sys.version}\n")
+    f.write(f"Received type: {type(config_array)}\n")
+    f.write(f"Received value: {config_array}\n")
+    f.write(f"Is list: {isinstance(config_array, (list, tuple))}\n")
+    if isinstance(config_array, (list, tuple)):
+        f.write(f"Length: {len(config_array)}\n")
+        f.write(f"First element type: {type(config_array[0]) if len(config_array) > 0 else 'N/A'}\n")
+    return f
+
+
+def _test_llm_connection(commander):
+    """Run the commander's LLM connection test and log the outcome
+
+    Started on a daemon thread by init(). The outcome is stored on
+    commander.llm_test_result as (success, message), after which
+    commander.llm_test_done is set.
+    """
+    try:
+        # Use the client's built-in test_connection() method
+        # This works with all provider types (native SDK and OpenAI-compat)
+        success, message = commander.llm_client.test_connection()
+    except Exception as llm_test_error:
+        commander.llm_test_result = (False, str(llm_test_error))
+        commander.llm_test_done.set()
+        logger.warning('LLM connection test failed: %s', llm_test_error)
+        logger.warning('BATCOM will continue with rule-based decisions only')
+        return
+
+    commander.llm_test_result = (success, message)
+    commander.llm_test_done.set()
+    if success:
+        logger.info('LLM connected to %s', commander.llm_client.model)
+        logger.info('LLM says: %s', message)
+    else:
+        logger.warning('LLM test failed: %s', message)
+
+
+def _llm_test_status(commander) -> str:
+    """Summarize the init() connection test for status replies"""
+    if not commander.llm_test_done.is_set():
+        return "pending"
+    if commander.llm_test_result is None:
+        return "not run"
+    success, message = commander.llm_test_result
+    return "ok" if success else f"failed: {message}"
+
+
 def init(config_array):
     """
     Initialize BATCOM with configuration from SQF
@@ -127,32 +253,16 @@ def init(config_array):
     """
     global _logger, _config, _initialized, _commander, _world_scanner, _command_queue, _state_manager, _admin_handler
 
-    # Early debug logging to file
-    try:
-        with open('batcom_init_debug.txt', 'w') as f:
-            import sys
-            f.write("="*60 + "\n")
-            f.write("BATCOM Python init() called\n")
-            f.write("="*60 + "\n")
-            f.write(f"Python version: {sys.version}\n")
-            f.write(f"Received type: {type(config_array)}\n")
-            f.write(f"Received value: {config_array}\n")
-            f.write(f"Is list: {isinstance(config_array, (list, tuple))}\n")
-            if isinstance(config_array, (list, tuple)):
-                f.write(f"Length: {len(config_array)}\n")
-                f.write(f"First element type: {type(config_array[0]) if len(config_array) > 0 else 'N/A'}\n")
-    except Exception as e:
-        # If file write fails, continue anyway
-        pass
+    # Debug file tracing is opt-in (set BATCOM_INIT_DEBUG) and uses one
+    # buffered handle for the whole call
+    debug_file = _open_init_debug(config_array) if os.environ.get('BATCOM_INIT_DEBUG') else None
 
     try:
-        print("[BATCOM.PY] init() called")
-        print(f"[BATCOM.PY] Received config_array type: {type(config_array)}")
+        logger.debug("init() called with config_array type: %s", type(config_array))
 
         # Convert array to dictionary (Pythia doesn't support hashmaps)
-        print("[BATCOM.PY] Converting array to dict...")
         config_dict = _array_to_dict(config_array)
-        print(f"[BATCOM.PY] Converted to dict with keys: {list(config_dict.keys())}")
+        logger.debug("Converted config to dict with keys: %s", list(config_dict.keys()))
 
         # Apply guardrails overrides
         guardrails = _load_guardrails()
@@ -163,20 +273,16 @@ def init(config_array):
                 ai_cfg.update(guardrails_current)
                 config_dict['ai'] = ai_cfg
             else:
-                config_dict['ai'] = guardrails_current
-            print(f"[BATCOM.PY] Applied guardrails current profile: {guardrails_current}")
+                config_dict['ai'] = dict(guardrails_current)
+            logger.debug("Applied guardrails current profile: %s", guardrails_current)
 
-        # Update debug file
-        try:
-            with open('batcom_init_debug.txt', 'a') as f:
-                f.write(f"Converted to dict: {config_dict}\n")
-                f.write(f"Dict keys: {list(config_dict.keys())}\n")
-        except:
-            pass
+        if debug_file:
+            debug_file.write(f"Converted to dict: {config_dict}\n")
+            debug_file.write(f"Dict keys: {list(config_dict.keys())}\n")
 
         # Setup logging first
         logging_config = config_dict.get('logging', {})
-        print(f"[BATCOM.PY] Setting up logging with config: {logging_config}")
+        from .utils.logging_setup import setup_logging
         _logger = setup_logging(logging_config)
 
         _logger.info('='*60)
@@ -188,6 +294,7 @@ def init(config_array):
         _logger.debug('Configuration loaded: %s', config_dict.keys())
 
         # Initialize state manager
+        from .runtime.state import StateManager
         _state_manager = StateManager()
         _logger.info('State manager initialized')
 
@@ -199,22 +306,24 @@ def init(config_array):
                 _logger.warning("Failed to apply guardrails to runtime config: %s", e)
 
         # Initialize admin handler
+        from .runtime.admin import AdminCommandHandler
         _admin_handler = AdminCommandHandler(_state_manager, guardrails_path=GUARDRAILS_PATH)
         _logger.info('Admin handler initialized')
 
         # Initialize world scanner
+        from .world.scanner import WorldScanner
         _world_scanner = WorldScanner()
         _logger.info('World scanner initialized')
 
         # Initialize command queue
         runtime_config = config_dict.get('runtime', {})
         max_commands = runtime_config.get('max_commands_per_tick', 30)
+        from .commands.queue import CommandQueue
         _command_queue = CommandQueue(max_commands_per_batch=max_commands)
         _logger.info('Command queue initialized (max batch: %d)', max_commands)
 
         # Initialize commander (decision loop)
-        from .runtime.commander import batcom
-        _commander = batcom(_state_manager, _command_queue, config_dict)
+        _commander = _get_commander_cls()(_state_manager, _command_queue, config_dict)
         _logger.info('Battlefield commander initialized')
 
         # Link commander to admin handler (for token stats access)
@@ -227,10 +336,9 @@ def init(config_array):
                     scan_config.get('ai_groups', 5.0),
                     scan_config.get('players', 3.0))
 
-        runtime_config = config_dict.get('runtime', {})
         _logger.info('Runtime limits - msgs/tick: %d, cmds/tick: %d, max_groups: %d',
                     runtime_config.get('max_messages_per_tick', 50),
-                    runtime_config.get('max_commands_per_tick', 30),
+                    max_commands,
                     runtime_config.get('max_controlled_groups', 500))
 
         ai_config = config_dict.get('ai', {})
@@ -238,87 +346,67 @@ def init(config_array):
             _logger.info('AI integration - provider: %s, model: %s',
                         ai_config.get('provider', 'openai'),
                         ai_config.get('model', 'gpt-4'))
+
+            # Test LLM connection. The test is a real provider round trip,
+            # so it runs in the background instead of stalling the SQF call.
+            if _commander.llm_enabled:
+                _logger.info('Testing LLM connection in background...')
+                _commander.llm_test_done.clear()
+                threading.Thread(target=_test_llm_connection, args=(_commander,), daemon=True).start()
+            else:
+                _logger.warning('LLM not enabled - skipping connection test')
+                _commander.llm_test_result = (False, 'LLM not enabled at init')
         else:
             _logger.info('AI integration disabled - rule-based decisions only')
-
-        # Test LLM connection if enabled
-        if ai_config.get('enabled', True):
-            _logger.info('Testing LLM connection...')
-            try:
-                if _commander.llm_enabled:
-                    # Use the client's built-in test_connection() method
-                    # This works with all provider types (native SDK and OpenAI-compat)
-                    success, message = _commander.llm_client.test_connection()
-
-                    if success:
-                        _logger.info(f'LLM connected to {_commander.llm_client.model}')
-                        _logger.info(f'LLM says: {message}')
-                    else:
-                        _logger.warning(f'LLM test failed: {message}')
-                else:
-                    _logger.warning('LLM not enabled - skipping connection test')
-            except Exception as llm_test_error:
-                _logger.warning(f'LLM connection test failed: {llm_test_error}')
-                _logger.warning('BATCOM will continue with rule-based decisions only')
+            _commander.llm_test_result = (False, 'AI integration disabled')
 
         # Mark as initialized
         _initialized = True
 
         _logger.info('BATCOM initialization complete')
-        print("[BATCOM.PY] Init successful!")
 
         # Convert dict to array for Pythia (it doesn't support dict->hashmap)
         result_dict = {
             "status": "ok",
             "version": "1.0.0"
         }
-        print(f"[BATCOM.PY] Converting result dict to array: {result_dict}")
         result_array = _dict_to_array(result_dict)
-        print(f"[BATCOM.PY] Result array: {result_array}")
-        print(f"[BATCOM.PY] Result array type: {type(result_array)}")
-        print(f"[BATCOM.PY] Returning result...")
 
-        # Write final status to debug file
-        try:
-            with open('batcom_init_debug.txt', 'a') as f:
-                f.write("="*60 + "\n")
-                f.write("SUCCESS - Returning result\n")
-                f.write(f"Result dict: {result_dict}\n")
-                f.write(f"Result array: {result_array}\n")
-                f.write("="*60 + "\n")
-        except:
-            pass
+        if debug_file:
+            debug_file.write("="*60 + "\n")
+            debug_file.write("SUCCESS - Returning result\n")
+            debug_file.write(f"Result dict: {result_dict}\n")
+            debug_file.write(f"Result array: {result_array}\n")
+            debug_file.write("="*60 + "\n")
 
         return result_array
 
     except Exception as e:
         error_msg = str(e)
-        print(f"[BATCOM.PY] ✗✗✗ ERROR: {error_msg}")
-        import traceback
-        traceback.print_exc()
 
-        # Write error to debug file
-        try:
-            with open('batcom_init_debug.txt', 'a') as f:
-                f.write("="*60 + "\n")
-                f.write("ERROR occurred\n")
-                f.write(f"Error: {error_msg}\n")
-                f.write(f"Traceback:\n{traceback.format_exc()}\n")
-                f.write("="*60 + "\n")
-        except:
-            pass
+        if debug_file:
+            import traceback
+            debug_file.write("="*60 + "\n")
+            debug_file.write("ERROR occurred\n")
+            debug_file.write(f"Error: {error_msg}\n")
+            debug_file.write(f"Traceback:\n{traceback.format_exc()}\n")
+            debug_file.write("="*60 + "\n")
 
         if _logger:
             _logger.exception('Failed to initialize BATCOM')
+        elif os.environ.get('BATCOM_DEBUG'):
+            # Logging isn't set up yet; SQF still gets error_msg in the result
+            import traceback
+            sys.stderr.write(f"[BATCOM.PY] init() failed: {error_msg}\n{traceback.format_exc()}")
 
-        # Convert dict to array for Pythia (it doesn't support dict->hashmap)
-        error_dict = {
-            "status": "error",
-            "error": error_msg
-        }
-        error_array = _dict_to_array(error_dict)
-        print(f"[BATCOM.PY] Returning error array: {error_array}")
-        return error_array
+        return _err(error_msg)
+
+    finally:
+        if debug_file:
+            try:
+                debug_file.close()
+            except OSError:
+                pass
 
 
 def shutdown():
@@ -335,7 +423,7 @@ def shutdown():
 
     try:
         if not _initialized:
-            return _dict_to_array({"status": "ok", "message": "BATCOM was not initialized"})
+            return _NOT_INITIALIZED_SHUTDOWN_RESULT
 
         _logger.info('Shutting down BATCOM...')
 
@@ -362,15 +450,12 @@ def shutdown():
 
         _logger.info('BATCOM shutdown complete')
 
-        return _dict_to_array({"status": "ok"})
+        return _OK_RESULT
 
     except Exception as e:
         if _logger:
             _logger.exception('Error during BATCOM shutdown')
-        return _dict_to_array({
-            "status": "error",
-            "error": str(e)
-        })
+        return _err(str(e))
 
 
 def is_initialized():
@@ -412,24 +497,16 @@ def world_snapshot(snapshot_data):
     Example from SQF:
         ["batcom.world_snapshot", [_snapshot]] call py3_fnc_callExtension
     """
-    global _world_scanner, _logger
-
     try:
         # Convert from nested array to dict if needed
         if isinstance(snapshot_data, (list, tuple)):
             snapshot_data = _array_to_dict(snapshot_data)
 
         if not _initialized:
-            return _dict_to_array({
-                "status": "error",
-                "error": "BATCOM not initialized"
-            })
+            return _NOT_INITIALIZED_RESULT
 
         if _world_scanner is None:
-            return _dict_to_array({
-                "status": "error",
-                "error": "World scanner not initialized"
-            })
+            return _err("World scanner not initialized")
 
         # Process the snapshot
         world_state = _world_scanner.ingest_snapshot(snapshot_data)
@@ -438,15 +515,12 @@ def world_snapshot(snapshot_data):
         if _commander is not None:
             _commander.process_world_state(world_state)
 
-        return _dict_to_array({"status": "ok"})
+        return _OK_RESULT
 
     except Exception as e:
         if _logger:
             _logger.exception('Failed to process world snapshot')
-        return _dict_to_array({
-            "status": "error",
-            "error": str(e)
-        })
+        return _err(str(e))
 
 
 def get_pending_commands():
@@ -459,20 +533,12 @@ def get_pending_commands():
     Example from SQF:
         ["batcom.get_pending_commands", []] call py3_fnc_callExtension
     """
-    global _command_queue, _logger
-
     try:
         if not _initialized:
-            return _dict_to_array({
-                "status": "error",
-                "error": "BATCOM not initialized"
-            })
+            return _NOT_INITIALIZED_RESULT
 
         if _command_queue is None:
-            return _dict_to_array({
-                "status": "error",
-                "error": "Command queue not initialized"
-            })
+            return _err("Command queue not initialized")
 
         # Get batch of commands
         commands = _command_queue.get_batch()
@@ -485,11 +551,7 @@ def get_pending_commands():
     except Exception as e:
         if _logger:
             _logger.exception('Failed to get pending commands')
-        return _dict_to_array({
-            "status": "error",
-            "error": str(e),
-            "commands": []
-        })
+        return _err_with_commands(str(e))
 
 
 def batcom_init(command, params, flag=False):
@@ -507,25 +569,17 @@ def batcom_init(command, params, flag=False):
     Example from SQF:
         ["batcom.batcom_init", ["commanderBrief", "Protect HVT", true]] call py3_fnc_callExtension
     """
-    global _admin_handler, _logger, _commander
-
     try:
         if not _initialized:
-            return _dict_to_array({
-                "status": "error",
-                "error": "BATCOM not initialized"
-            })
+            return _NOT_INITIALIZED_RESULT
 
         if _admin_handler is None:
-            return _dict_to_array({
-                "status": "error",
-                "error": "Admin handler not initialized"
-            })
+            return _err("Admin handler not initialized")
 
         # Convert params from nested array to dict if needed (Pythia converts hashmaps to arrays)
         if isinstance(params, (list, tuple)):
             # Check if this looks like a dict structure (array of [key, value] pairs)
-            if all(isinstance(item, (list, tuple)) and len(item) == 2 for item in params):
+            if _is_pairs(params):
                 params = _array_to_dict(params)
 
         # Route to admin handler
@@ -541,10 +595,7 @@ def batcom_init(command, params, flag=False):
     except Exception as e:
         if _logger:
             _logger.exception('Failed to handle admin command: %s', command)
-        return _dict_to_array({
-            "status": "error",
-            "error": str(e)
-        })
+        return _err(str(e))
 
 
 def test_gemini_connection():
@@ -557,29 +608,26 @@ def test_gemini_connection():
     Example from SQF:
         ["batcom.test_gemini_connection", []] call py3_fnc_callExtension
     """
-    global _commander, _logger, _config
-
     try:
         if not _initialized:
-            return _dict_to_array({
-                "status": "error",
-                "error": "BATCOM not initialized. Call init first."
-            })
+            return _err("BATCOM not initialized. Call init first.")
 
         if _commander is None:
+            return _err("Commander not initialized")
+
+        # The init() test still owns the client; don't block the SQF call on it
+        # or swap the client under it with _init_llm()
+        if not _commander.llm_test_done.is_set():
             return _dict_to_array({
-                "status": "error",
-                "error": "Commander not initialized"
+                "status": "pending",
+                "init_test": _llm_test_status(_commander)
             })
 
         # Ensure LLM is initialized (supports runtime API key injection)
         if not _commander.llm_enabled:
             ai_config = _config.get('ai', {}) if _config else {}
             if not ai_config.get('enabled', False):
-                return _dict_to_array({
-                    "status": "error",
-                    "error": "LLM is disabled in CfgBATCOM (ai.enabled = 0)"
-                })
+                return _err("LLM is disabled in CfgBATCOM (ai.enabled = 0)")
 
             # Try to (re)initialize with current state/api key
             try:
@@ -589,16 +637,12 @@ def test_gemini_connection():
                     _logger.exception("LLM reinit failed during test: %s", reinit_err)
 
             if not _commander.llm_enabled:
-                import os
                 key_cfg = _state_manager.api_keys.get('gemini') if _state_manager else {}
                 api_key_present = bool((key_cfg or {}).get('key') or os.getenv('GEMINI_API_KEY'))
                 hint = "LLM failed to initialize (check logs for details)"
                 if not api_key_present:
                     hint = "GEMINI_API_KEY not set (env or runtime)"
-                return _dict_to_array({
-                    "status": "error",
-                    "error": hint
-                })
+                return _err(hint)
 
         # Test the connection with a simple prompt
         _logger.info("Testing Gemini LLM connection...")
@@ -611,41 +655,37 @@ Keep it under 50 words and professional/military style.
 
 Output ONLY the greeting text, no JSON or other formatting."""
 
-            response = _commander.llm_client.client.models.generate_content(
-                model=_commander.llm_client.model,
+            llm_client = _commander.llm_client
+            model = llm_client.model
+            response = llm_client.client.models.generate_content(
+                model=model,
                 contents=test_prompt
             )
 
-            if response.text:
-                greeting = response.text.strip()
+            # response.text joins the candidate parts on every access
+            text = response.text
+            if text:
+                greeting = text.strip()
                 _logger.info("Gemini test successful: %s", greeting)
 
                 return _dict_to_array({
                     "status": "ok",
-                    "model": _commander.llm_client.model,
+                    "model": model,
                     "greeting": greeting,
-                    "llm_enabled": True
+                    "llm_enabled": True,
+                    "init_test": _llm_test_status(_commander)
                 })
             else:
-                return _dict_to_array({
-                    "status": "error",
-                    "error": "Gemini returned empty response"
-                })
+                return _err("Gemini returned empty response")
 
         except Exception as api_error:
             _logger.error("Gemini API error: %s", api_error, exc_info=True)
-            return _dict_to_array({
-                "status": "error",
-                "error": f"Gemini API call failed: {str(api_error)}"
-            })
+            return _err(f"Gemini API call failed: {str(api_error)}")
 
     except Exception as e:
         if _logger:
             _logger.exception('Failed to test Gemini connection')
-        return _dict_to_array({
-            "status": "error",
-            "error": str(e)
-        })
+        return _err(str(e))
 
 
 def set_ao_defense_phase(active):
@@ -669,20 +709,12 @@ def set_ao_defense_phase(active):
         // Deactivate when threat is neutralized
         ["batcom.set_ao_defense_phase", [false]] call py3_fnc_callExtension;
     """
-    global _state_manager, _logger
-
     try:
         if not _initialized:
-            return _dict_to_array({
-                "status": "error",
-                "error": "BATCOM not initialized"
-            })
+            return _NOT_INITIALIZED_RESULT
 
         if _state_manager is None:
-            return _dict_to_array({
-                "status": "error",
-                "error": "State manager not initialized"
-            })
+            return _err("State manager not initialized")
 
         # Convert to boolean
         active_bool = bool(active)
@@ -691,7 +723,7 @@ def set_ao_defense_phase(active):
         _state_manager.set_ao_defense_phase(active_bool)
 
         if _logger:
-            _logger.info(f"AO Defense Phase {'ACTIVATED' if active_bool else 'DEACTIVATED'} via API")
+            _logger.info("AO Defense Phase %s via API", 'ACTIVATED' if active_bool else 'DEACTIVATED')
 
         return _dict_to_array({
             "status": "ok",
@@ -702,10 +734,7 @@ def set_ao_defense_phase(active):
     except Exception as e:
         if _logger:
             _logger.exception('Failed to set AO defense phase')
-        return _dict_to_array({
-            "status": "error",
-            "error": str(e)
-        })
+        return _err(str(e))
 
 
 def load_resource_template(template_name):
@@ -721,20 +750,12 @@ def load_resource_template(template_name):
     Example from SQF:
         ["batcom.load_resource_template", ["medium"]] call py3_fnc_callExtension;
     """
-    global _state_manager, _logger
-
     try:
         if not _initialized:
-            return _dict_to_array({
-                "status": "error",
-                "error": "BATCOM not initialized"
-            })
+            return _NOT_INITIALIZED_RESULT
 
         if _state_manager is None:
-            return _dict_to_array({
-                "status": "error",
-                "error": "State manager not initialized"
-            })
+            return _err("State manager not initialized")
 
         # Import resource loader
         from .config.resource_loader import load_template
@@ -742,16 +763,13 @@ def load_resource_template(template_name):
         # Load the template
         resource_pool = load_template(template_name)
         if not resource_pool:
-            return _dict_to_array({
-                "status": "error",
-                "error": f"Template '{template_name}' not found"
-            })
+            return _err(f"Template '{template_name}' not found")
 
         # Apply to state manager
         _state_manager.set_resource_pool(resource_pool)
 
         if _logger:
-            _logger.info(f"Loaded resource template '{template_name}'")
+            _logger.info("Loaded resource template '%s'", template_name)
 
         # Get summary of what was loaded
         sides = list(resource_pool.keys())
@@ -767,11 +785,8 @@ def load_resource_template(template_name):
 
     except Exception as e:
         if _logger:
-            _logger.exception(f'Failed to load resource template {template_name}')
-        return _dict_to_array({
-            "status": "error",
-            "error": str(e)
-        })
+            _logger.exception('Failed to load resource template %s', template_name)
+        return _err(str(e))
 
 
 def get_state():
@@ -783,7 +798,6 @@ def get_state():
 
     Note: This is for Python API use, not SQF
     """
-    global _state_manager
     return _state_manager
 
 
@@ -805,19 +819,17 @@ def resource_pool_add_asset(side, asset_type, max_count, unit_classes=None, defe
     Example from SQF:
         ["batcom.resource_pool_add_asset", ["EAST", "infantry_squad", 5, ["O_Soldier_F"], false, "Basic infantry"]] call py3_fnc_callExtension;
     """
-    global _state_manager, _logger
-
     try:
         if not _initialized:
-            return _dict_to_array({"status": "error", "error": "BATCOM not initialized"})
+            return _NOT_INITIALIZED_RESULT
 
         if _state_manager is None:
-            return _dict_to_array({"status": "error", "error": "State manager not initialized"})
+            return _err("State manager not initialized")
 
         # Normalize side
         side = side.upper()
         if side not in ["EAST", "WEST", "RESISTANCE", "INDEPENDENT"]:
-            return _dict_to_array({"status": "error", "error": f"Invalid side: {side}"})
+            return _err(f"Invalid side: {side}")
 
         # Get current resource pool or create new one
         current_pool = _state_manager.resource_pool
@@ -847,7 +859,7 @@ def resource_pool_add_asset(side, asset_type, max_count, unit_classes=None, defe
         _state_manager.set_resource_pool(current_pool)
 
         if _logger:
-            _logger.info(f"Added/updated asset {side}:{asset_type} (max={max_count}, defense_only={defense_only})")
+            _logger.info("Added/updated asset %s:%s (max=%s, defense_only=%s)", side, asset_type, max_count, defense_only)
 
         return _dict_to_array({
             "status": "ok",
@@ -861,7 +873,7 @@ def resource_pool_add_asset(side, asset_type, max_count, unit_classes=None, defe
     except Exception as e:
         if _logger:
             _logger.exception('Failed to add asset to resource pool')
-        return _dict_to_array({"status": "error", "error": str(e)})
+        return _err(str(e))
 
 
 def resource_pool_remove_asset(side, asset_type):
@@ -878,26 +890,21 @@ def resource_pool_remove_asset(side, asset_type):
     Example from SQF:
         ["batcom.resource_pool_remove_asset", ["EAST", "infantry_squad"]] call py3_fnc_callExtension;
     """
-    global _state_manager, _logger
-
     try:
         if not _initialized:
-            return _dict_to_array({"status": "error", "error": "BATCOM not initialized"})
+            return _NOT_INITIALIZED_RESULT
 
         side = side.upper()
         current_pool = _state_manager.resource_pool
 
         if side not in current_pool or asset_type not in current_pool[side]:
-            return _dict_to_array({
-                "status": "error",
-                "error": f"Asset {asset_type} not found for {side}"
-            })
+            return _err(f"Asset {asset_type} not found for {side}")
 
         del current_pool[side][asset_type]
         _state_manager.set_resource_pool(current_pool)
 
         if _logger:
-            _logger.info(f"Removed asset {side}:{asset_type}")
+            _logger.info("Removed asset %s:%s", side, asset_type)
 
         return _dict_to_array({
             "status": "ok",
@@ -907,7 +914,7 @@ def resource_pool_remove_asset(side, asset_type):
     except Exception as e:
         if _logger:
             _logger.exception('Failed to remove asset')
-        return _dict_to_array({"status": "error", "error": str(e)})
+        return _err(str(e))
 
 
 def resource_pool_clear_side(side):
@@ -923,21 +930,15 @@ def resource_pool_clear_side(side):
     Example from SQF:
         ["batcom.resource_pool_clear_side", ["EAST"]] call py3_fnc_callExtension;
     """
-    global _state_manager, _logger
-
     try:
         if not _initialized:
-            return _dict_to_array({"status": "error", "error": "BATCOM not initialized"})
+            return _NOT_INITIALIZED_RESULT
 
         side = side.upper()
-        current_pool = _state_manager.resource_pool
-
-        if side in current_pool:
-            del current_pool[side]
-            _state_manager.set_resource_pool(current_pool)
 
+        if _state_manager.clear_side(side):
             if _logger:
-                _logger.info(f"Cleared all assets for {side}")
+                _logger.info("Cleared all assets for %s", side)
 
             return _dict_to_array({
                 "status": "ok",
@@ -952,7 +953,7 @@ def resource_pool_clear_side(side):
     except Exception as e:
         if _logger:
             _logger.exception('Failed to clear side resources')
-        return _dict_to_array({"status": "error", "error": str(e)})
+        return _err(str(e))
 
 
 def resource_pool_get_status():
@@ -965,31 +966,39 @@ def resource_pool_get_status():
     Example from SQF:
         private _status = ["batcom.resource_pool_get_status", []] call py3_fnc_callExtension;
     """
-    global _state_manager, _logger
-
+    global _resource_status_cache
     try:
         if not _initialized:
-            return _dict_to_array({"status": "error", "error": "BATCOM not initialized"})
+            return _NOT_INITIALIZED_RESULT
 
         if _state_manager is None:
-            return _dict_to_array({"status": "error", "error": "State manager not initialized"})
-
-        # Get full resource status
-        status = _state_manager.get_resource_status()
+            return _err("State manager not initialized")
 
         # Get AO defense phase status
         ao_defense_active = _state_manager.is_ao_defense_phase()
 
-        return _dict_to_array({
+        # SQF polls this; only rebuild when the pool, usage or phase changed
+        key = (_state_manager, _state_manager.resource_version,
+               _state_manager.resource_usage_version, ao_defense_active)
+        cached = _resource_status_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # Get full resource status
+        status = _state_manager.get_resource_status()
+
+        result = _dict_to_array({
             "status": "ok",
             "resource_pool": status,
             "ao_defense_phase": ao_defense_active
         })
+        _resource_status_cache = (key, result)
+        return result
 
     except Exception as e:
         if _logger:
             _logger.exception('Failed to get resource pool status')
-        return _dict_to_array({"status": "error", "error": str(e)})
+        return _err(str(e))
 
 
 def resource_pool_list_templates():
@@ -1002,12 +1011,16 @@ def resource_pool_list_templates():
     Example from SQF:
         private _templates = ["batcom.resource_pool_list_templates", []] call py3_fnc_callExtension;
     """
-    global _logger
-
+    global _templates_cache
     try:
         from .config.resource_loader import get_loader
 
         loader = get_loader()
+        # Templates are read once when the loader is created
+        cached = _templates_cache
+        if cached is not None and cached[0] is loader:
+            return cached[1]
+
         template_names = loader.list_templates()
 
         templates_info = []
@@ -1019,15 +1032,17 @@ def resource_pool_list_templates():
                     "description": template.get("description", "No description")
                 })
 
-        return _dict_to_array({
+        result = _dict_to_array({
             "status": "ok",
             "templates": templates_info
         })
+        _templates_cache = (loader, result)
+        return result
 
     except Exception as e:
         if _logger:
             _logger.exception('Failed to list templates')
-        return _dict_to_array({"status": "error", "error": str(e)})
+        return _err(str(e))
 
 
 # Future API functions will be added here in later phases:
@@ -37,3 +37,8 @@ DEFAULT_CONFIG = {
         "audit_log": True
     }
 }
+
+# Frozen views of the safety command lists for membership tests; the lists
+# above stay as-is so DEFAULT_CONFIG remains plain JSON-compatible data
+ALLOWED_COMMANDS = frozenset(DEFAULT_CONFIG["safety"]["allowed_commands"])
+BLOCKED_COMMANDS = frozenset(DEFAULT_CONFIG["safety"]["blocked_commands"])
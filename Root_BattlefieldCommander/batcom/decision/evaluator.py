@@ -5,12 +5,17 @@ Assesses objective states based on current world state.
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from ..models.objectives import Objective, ObjectiveType, ObjectiveState
-from ..models.world import WorldState, Group
+from ..models.world import WorldState
 
 logger = logging.getLogger('batcom.decision.evaluator')
 
+# Objective states that are no longer evaluated
+_FINAL_STATES = frozenset((ObjectiveState.COMPLETED, ObjectiveState.FAILED))
+# Objective types whose enemy_count marks them as contested
+_CONTESTED_TYPES = frozenset((ObjectiveType.DEFEND_AREA, ObjectiveType.ATTACK_AREA))
+
 
 class ObjectiveEvaluator:
     """
@@ -18,7 +23,15 @@ class ObjectiveEvaluator:
     """
 
     def __init__(self):
-        pass
+        # Type-specific evaluation handlers
+        self._dispatch = {
+            ObjectiveType.PROTECT_HVT: self._evaluate_protect_hvt,
+            ObjectiveType.DEFEND_AREA: self._evaluate_defend_area,
+            ObjectiveType.ATTACK_AREA: self._evaluate_attack_area,
+            ObjectiveType.PATROL_AREA: self._evaluate_patrol_area,
+            ObjectiveType.ELIMINATE_UNITS: self._evaluate_eliminate_units,
+            ObjectiveType.CUSTOM: self._evaluate_custom,
+        }
 
     def evaluate_objectives(self, objectives: List[Objective], world_state: WorldState) -> List[Objective]:
         """
@@ -51,7 +64,7 @@ class ObjectiveEvaluator:
             Updated objective
         """
         # Skip if already completed or failed
-        if objective.state in [ObjectiveState.COMPLETED, ObjectiveState.FAILED]:
+        if objective.state in _FINAL_STATES:
             return objective
 
         # Activate pending objectives
@@ -60,20 +73,10 @@ class ObjectiveEvaluator:
             logger.info('Objective %s activated: %s', objective.id, objective.description)
 
         # Type-specific evaluation
-        if objective.type == ObjectiveType.PROTECT_HVT:
-            return self._evaluate_protect_hvt(objective, world_state)
-        elif objective.type == ObjectiveType.DEFEND_AREA:
-            return self._evaluate_defend_area(objective, world_state)
-        elif objective.type == ObjectiveType.ATTACK_AREA:
-            return self._evaluate_attack_area(objective, world_state)
-        elif objective.type == ObjectiveType.PATROL_AREA:
-            return self._evaluate_patrol_area(objective, world_state)
-        elif objective.type == ObjectiveType.ELIMINATE_UNITS:
-            return self._evaluate_eliminate_units(objective, world_state)
-        elif objective.type == ObjectiveType.CUSTOM:
-            return self._evaluate_custom(objective, world_state)
-
-        return objective
+        handler = self._dispatch.get(objective.type)
+        if handler is None:
+            return objective
+        return handler(objective, world_state)
 
     def _evaluate_protect_hvt(self, objective: Objective, world_state: WorldState) -> Objective:
         """Evaluate PROTECT_HVT objective"""
@@ -90,12 +93,12 @@ class ObjectiveEvaluator:
 
         # Count friendlies in area
         friendly_count = self._count_units_in_area(
-            objective.position, radius, world_state.controlled_groups
+            objective.position, radius, world_state.area_points(True)
         )
 
         # Count enemies in area
         enemy_count = self._count_units_in_area(
-            objective.position, radius, world_state.enemy_groups
+            objective.position, radius, world_state.area_points(False)
         )
 
         objective.metadata['friendly_count'] = friendly_count
@@ -118,12 +121,12 @@ class ObjectiveEvaluator:
 
         # Count enemies in area
         enemy_count = self._count_units_in_area(
-            objective.position, radius, world_state.enemy_groups
+            objective.position, radius, world_state.area_points(False)
         )
 
         # Count friendlies in area
         friendly_count = self._count_units_in_area(
-            objective.position, radius, world_state.controlled_groups
+            objective.position, radius, world_state.area_points(True)
         )
 
         objective.metadata['enemy_count'] = enemy_count
@@ -158,28 +161,35 @@ class ObjectiveEvaluator:
         # Could add AI evaluation here in Phase 7
         return objective
 
-    def _count_units_in_area(self, position: List[float], radius: float, groups: List[Group]) -> int:
-        """Count units within radius of position"""
-        count = 0
+    def _count_units_in_area(self, position: List[float], radius: float,
+                             points: List[Tuple[float, float, int]]) -> int:
+        """
+        Count units within radius of position
 
-        for group in groups:
-            if not group.position:
-                continue
+        Args:
+            position: Area center
+            radius: Area radius in meters
+            points: (x, y, unit_count) tuples from WorldState.area_points()
+        """
+        count = 0
+        px = position[0]
+        py = position[1]
+        # Compare squared distances so no square root is needed per group
+        radius_sq = radius * radius
 
-            # Calculate distance
-            dx = group.position[0] - position[0]
-            dy = group.position[1] - position[1]
-            distance = (dx * dx + dy * dy) ** 0.5
+        for x, y, unit_count in points:
+            dx = x - px
+            dy = y - py
 
-            if distance <= radius:
+            if dx * dx + dy * dy <= radius_sq:
                 # Use unit_count instead of iterating over units
-                count += group.unit_count
+                count += unit_count
 
         return count
 
     def _count_nearby_threats(self, position: List[float], world_state: WorldState, radius: float) -> int:
         """Count enemy units near position"""
-        return self._count_units_in_area(position, radius, world_state.enemy_groups)
+        return self._count_units_in_area(position, radius, world_state.area_points(False))
 
     def get_active_objectives(self, objectives: List[Objective]) -> List[Objective]:
         """Get list of active objectives"""
@@ -193,14 +203,16 @@ class ObjectiveEvaluator:
             if obj.state != ObjectiveState.ACTIVE:
                 continue
 
+            metadata = obj.metadata
+
             # High threat level
-            if obj.metadata.get('threat_level', 0) > 5:
+            if metadata.get('threat_level', 0) > 5:
                 needs_attention.append(obj)
                 continue
 
             # Area being contested
-            if obj.type in [ObjectiveType.DEFEND_AREA, ObjectiveType.ATTACK_AREA]:
-                enemy_count = obj.metadata.get('enemy_count', 0)
+            if obj.type in _CONTESTED_TYPES:
+                enemy_count = metadata.get('enemy_count', 0)
                 if enemy_count > 0:
                     needs_attention.append(obj)
 
@@ -3,92 +3,119 @@ AO outcome analysis and learning
 """
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, NamedTuple
 from ..models.effectiveness import AOPerformanceData
 
 logger = logging.getLogger('batcom.learning.ao_analyzer')
 
 
+class AOMetrics(NamedTuple):
+    """AO figures read once per analysis and shared by the helpers"""
+    duration: float
+    blufor_casualties: int
+    ai_casualties: int
+    objectives_lost: int
+    objectives_held: int
+    hvt_count: int
+    hvt_impact: int  # Objectives cleared by HVT players
+
+
 class AOAnalyzer:
     """Analyzes AO outcomes to improve AI performance"""
 
     def analyze_ao(self, ao_data: AOPerformanceData) -> Dict[str, any]:
         """Analyze AO outcome and generate insights"""
+        metrics = self._compute_metrics(ao_data)
 
         analysis = {
-            "outcome": self._determine_outcome(ao_data),
-            "ai_effectiveness": self._calculate_ai_effectiveness(ao_data),
-            "key_failures": self._identify_failures(ao_data),
-            "tactical_insights": self._generate_insights(ao_data)
+            "outcome": self._determine_outcome(metrics),
+            "ai_effectiveness": self._calculate_ai_effectiveness(metrics),
+            "key_failures": self._identify_failures(metrics),
+            "tactical_insights": self._generate_insights(metrics)
         }
 
-        logger.info(f"AO Analysis - Outcome: {analysis['outcome']}, AI Effectiveness: {analysis['ai_effectiveness']:.1f}%")
+        logger.info("AO Analysis - Outcome: %s, AI Effectiveness: %.1f%%",
+                    analysis['outcome'], analysis['ai_effectiveness'])
 
         return analysis
 
-    def _determine_outcome(self, ao_data: AOPerformanceData) -> str:
+    def _compute_metrics(self, ao_data: AOPerformanceData) -> AOMetrics:
+        """Read the figures the analysis needs from ao_data in one pass"""
+        player_stats = ao_data.player_stats
+        hvt_impact = 0
+        for uid in ao_data.hvt_players:
+            stats = player_stats.get(uid)
+            if stats is not None:
+                hvt_impact += stats.objectives_cleared
+
+        return AOMetrics(
+            duration=ao_data.duration,
+            blufor_casualties=ao_data.blufor_casualties,
+            ai_casualties=ao_data.ai_casualties,
+            objectives_lost=ao_data.objectives_lost,
+            objectives_held=ao_data.objectives_held,
+            hvt_count=len(ao_data.hvt_players),
+            hvt_impact=hvt_impact
+        )
+
+    def _determine_outcome(self, metrics: AOMetrics) -> str:
         """Determine if AI won, lost, or stalemate"""
-        if ao_data.objectives_lost > ao_data.objectives_held:
+        if metrics.objectives_lost > metrics.objectives_held:
             return "DEFEAT"
-        elif ao_data.objectives_held > ao_data.objectives_lost:
+        elif metrics.objectives_held > metrics.objectives_lost:
             return "VICTORY"
         else:
             # Use casualty ratios
-            if ao_data.blufor_casualties > ao_data.ai_casualties * 2:
+            if metrics.blufor_casualties > metrics.ai_casualties * 2:
                 return "VICTORY"
-            elif ao_data.ai_casualties > ao_data.blufor_casualties * 2:
+            elif metrics.ai_casualties > metrics.blufor_casualties * 2:
                 return "DEFEAT"
             return "STALEMATE"
 
-    def _calculate_ai_effectiveness(self, ao_data: AOPerformanceData) -> float:
+    def _calculate_ai_effectiveness(self, metrics: AOMetrics) -> float:
         """Calculate AI effectiveness score (0-100)"""
         # Faster AO = worse for AI
-        speed_penalty = max(0, 100 - (ao_data.duration / 60))  # Penalty if under 100 minutes
+        speed_penalty = max(0, 100 - (metrics.duration / 60))  # Penalty if under 100 minutes
 
         # More AI losses = worse
         casualty_ratio = 50  # Base
-        if ao_data.blufor_casualties > 0:
-            ratio = ao_data.ai_casualties / ao_data.blufor_casualties
+        if metrics.blufor_casualties > 0:
+            ratio = metrics.ai_casualties / metrics.blufor_casualties
             casualty_ratio = max(0, 100 - (ratio * 50))
 
         # Objectives lost = bad
-        obj_penalty = ao_data.objectives_lost * 20
+        obj_penalty = metrics.objectives_lost * 20
 
         effectiveness = max(0, 100 - speed_penalty - obj_penalty + casualty_ratio)
         return min(100, effectiveness)
 
-    def _identify_failures(self, ao_data: AOPerformanceData) -> List[str]:
+    def _identify_failures(self, metrics: AOMetrics) -> List[str]:
         """Identify key failures"""
         failures = []
 
-        if ao_data.objectives_lost > 2:
+        if metrics.objectives_lost > 2:
             failures.append("Failed to defend multiple objectives")
 
-        if ao_data.duration < 1800:  # Less than 30 minutes
+        if metrics.duration < 1800:  # Less than 30 minutes
             failures.append("AO ended too quickly - insufficient resistance")
 
-        if ao_data.ai_casualties > ao_data.blufor_casualties * 3:
+        if metrics.ai_casualties > metrics.blufor_casualties * 3:
             failures.append("Excessive casualties - poor tactical decisions")
 
         return failures
 
-    def _generate_insights(self, ao_data: AOPerformanceData) -> List[str]:
+    def _generate_insights(self, metrics: AOMetrics) -> List[str]:
         """Generate tactical insights for next AO"""
         insights = []
 
         # Analyze HVT effectiveness
-        if ao_data.hvt_players:
-            hvt_impact = sum(
-                ao_data.player_stats[uid].objectives_cleared
-                for uid in ao_data.hvt_players
-                if uid in ao_data.player_stats
-            )
-            if hvt_impact > len(ao_data.hvt_players) * 2:
+        if metrics.hvt_count:
+            if metrics.hvt_impact > metrics.hvt_count * 2:
                 insights.append("HVT players highly effective - increase priority on neutralizing them")
 
         # Analyze objective defense patterns
         # (Would analyze which task_types were lost first)
 
-        insights.append(f"AO Duration: {ao_data.duration/60:.1f} min - Adjust pacing")
+        insights.append(f"AO Duration: {metrics.duration/60:.1f} min - Adjust pacing")
 
         return insights
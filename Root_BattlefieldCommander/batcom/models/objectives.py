@@ -28,7 +28,7 @@ class ObjectiveState(str, Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Objective:
     """
     Represents a mission objective
@@ -19,7 +19,7 @@ class TaskType(str, Enum):
     RETREAT = "retreat"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """
     Represents a task assigned to a group
@@ -54,7 +54,7 @@ class Task:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupAssignment:
     """
     Represents a group assigned to an objective
@@ -5,10 +5,13 @@ These classes represent the game world state at a point in time.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
+# Group.type values for aircraft
+AIR_GROUP_TYPES = frozenset(('air_rotary', 'air_fixed'))
 
-@dataclass
+
+@dataclass(slots=True)
 class UnitEquipment:
     """Represents equipment status for a single unit"""
     has_nvg: bool = False
@@ -16,7 +19,7 @@ class UnitEquipment:
     primary_weapon: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class CasualtyEvent:
     """Record of a unit death"""
     victim_id: str  # Unit ID or group ID
@@ -30,7 +33,7 @@ class CasualtyEvent:
     objective_id: Optional[str] = None  # If death occurred near objective
 
 
-@dataclass
+@dataclass(slots=True)
 class KnownEnemy:
     """Represents a known enemy group"""
     id: str
@@ -42,7 +45,7 @@ class KnownEnemy:
     last_seen: float  # seconds since last seen
 
 
-@dataclass
+@dataclass(slots=True)
 class Group:
     """Represents an AI group"""
     id: str
@@ -72,7 +75,7 @@ class Group:
     hvt_players: List[str] = field(default_factory=list)  # Player UIDs marked as HVTs in this group
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     """Represents a player"""
     name: str
@@ -89,7 +92,7 @@ class Player:
     threat_score: float = 0.0  # Calculated threat level
 
 
-@dataclass
+@dataclass(slots=True)
 class Objective:
     """Represents a mission objective marker"""
     id: str
@@ -103,7 +106,7 @@ class Objective:
     enemy_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class WorldState:
     """Complete world state snapshot"""
     timestamp: float
@@ -121,27 +124,115 @@ class WorldState:
     mission_time: float = 0.0
     is_night: bool = False
     ai_deployment: Dict[str, int] = field(default_factory=dict)  # {"EAST": 45, "WEST": 20}
+    # Per-snapshot lookup caches, built on first use. The snapshot is not
+    # modified after WorldScanner builds it, so they never need invalidating.
+    _controlled: Optional[List[Group]] = field(default=None, init=False, repr=False, compare=False)
+    _enemy: Optional[List[Group]] = field(default=None, init=False, repr=False, compare=False)
+    _group_index: Optional[Dict[str, Group]] = field(default=None, init=False, repr=False, compare=False)
+    _objective_index: Optional[Dict[str, Objective]] = field(default=None, init=False, repr=False, compare=False)
+    _player_index: Optional[Dict[str, Player]] = field(default=None, init=False, repr=False, compare=False)
+    # (controlled, enemy) lists of (x, y, unit_count)
+    _area_points: Optional[Tuple[List[Tuple[float, float, int]], List[Tuple[float, float, int]]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _has_air_threat: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+
+    def _split_groups(self):
+        """Partition groups into controlled and enemy lists in one pass"""
+        controlled = []
+        enemy = []
+        for g in self.groups:
+            if g.is_controlled:
+                controlled.append(g)
+            else:
+                enemy.append(g)
+        self._controlled = controlled
+        self._enemy = enemy
 
     @property
     def controlled_groups(self) -> List[Group]:
-        """Get only controlled groups"""
-        return [g for g in self.groups if g.is_controlled]
+        """Get only controlled groups (shared list - do not modify)"""
+        if self._controlled is None:
+            self._split_groups()
+        return self._controlled
 
     @property
     def enemy_groups(self) -> List[Group]:
-        """Get known enemy groups (non-controlled)"""
-        return [g for g in self.groups if not g.is_controlled]
+        """Get known enemy groups (non-controlled) (shared list - do not modify)"""
+        if self._enemy is None:
+            self._split_groups()
+        return self._enemy
+
+    @property
+    def has_air_threat(self) -> bool:
+        """Whether any enemy (non-controlled) group is an aircraft"""
+        if self._has_air_threat is None:
+            self._has_air_threat = any(g.type in AIR_GROUP_TYPES for g in self.enemy_groups)
+        return self._has_air_threat
+
+    def area_points(self, controlled: bool) -> List[Tuple[float, float, int]]:
+        """
+        Get (x, y, unit_count) for every positioned controlled or enemy group
+
+        Both lists are built on first use and reused for the rest of the
+        snapshot, so per-objective area counts scan flat tuples instead of
+        re-reading Group attributes.
+
+        Args:
+            controlled: True for controlled groups, False for enemy groups
+
+        Returns:
+            List of (x, y, unit_count) tuples
+        """
+        if self._area_points is None:
+            self._area_points = (
+                [(g.position[0], g.position[1], g.unit_count) for g in self.controlled_groups if g.position],
+                [(g.position[0], g.position[1], g.unit_count) for g in self.enemy_groups if g.position],
+            )
+        return self._area_points[0] if controlled else self._area_points[1]
+
+    def _groups_by_id(self) -> Dict[str, Group]:
+        """Get the group ID index (first group wins on duplicate IDs)"""
+        if self._group_index is None:
+            self._group_index = {g.id: g for g in reversed(self.groups)}
+        return self._group_index
 
     def get_group_by_id(self, group_id: str) -> Optional[Group]:
         """Find a group by ID"""
-        for group in self.groups:
-            if group.id == group_id:
-                return group
-        return None
+        try:
+            return self._groups_by_id().get(group_id)
+        except TypeError:
+            # Unhashable ID (e.g. malformed LLM params) can't match a group
+            return None
+
+    def get_groups_by_ids(self, group_ids) -> Dict[str, Group]:
+        """Find several groups by ID (unhashable IDs are skipped)"""
+        index = self._groups_by_id()
+        found = {}
+        for gid in group_ids:
+            try:
+                group = index.get(gid)
+            except TypeError:
+                # Unhashable ID (e.g. malformed LLM params) can't match a group
+                continue
+            if group is not None:
+                found[gid] = group
+        return found
+
+    def get_player_by_uid(self, uid: str) -> Optional[Player]:
+        """Find a player by UID (first player wins on duplicate UIDs)"""
+        if self._player_index is None:
+            self._player_index = {p.uid: p for p in reversed(self.players)}
+        try:
+            return self._player_index.get(uid)
+        except TypeError:
+            return None
 
     def get_objective_by_id(self, obj_id: str) -> Optional[Objective]:
         """Find an objective by ID"""
-        for obj in self.objectives:
-            if obj.id == obj_id:
-                return obj
-        return None
+        if self._objective_index is None:
+            self._objective_index = {o.id: o for o in reversed(self.objectives)}
+        try:
+            return self._objective_index.get(obj_id)
+        except TypeError:
+            return None
@@ -6,12 +6,108 @@ Processes admin commands from the debug console.
 
 import logging
 import json
-from typing import Any, Dict
+import os
+import re
+from typing import Any, Dict, List, Optional
 from .state import StateManager
 from ..models.objectives import Objective, ObjectiveType, ObjectiveState
 
 logger = logging.getLogger('batcom.runtime.admin')
 
+# "[x, y]" / "[x, y, z]" coordinates embedded in objective or intent text
+_COORD_RE = re.compile(r'\[([0-9\.\-,\s]+)\]')
+
+# First run of digits in an AO id ("AO_3" -> 3)
+_AO_NUM_RE = re.compile(r'\d+')
+
+
+def _parse_coords(text: str) -> Optional[List[float]]:
+    """
+    Parse the first [x, y(, z)] coordinate group out of free text
+
+    Args:
+        text: Text that may contain a bracketed coordinate list
+
+    Returns:
+        [x, y, z] padded with 0.0, or None if no usable coordinates were found
+    """
+    match = _COORD_RE.search(text)
+    if not match:
+        return None
+    parts = match.group(1).split(',')
+    if len(parts) < 2:
+        return None
+    try:
+        # Every part must parse; only the first three are kept, padded with 0.0
+        nums = [float(p) for p in parts]
+    except ValueError:
+        return None
+    if len(nums) == 2:
+        nums.append(0.0)
+        return nums
+    return nums[:3]
+
+
+# aoProgress event type -> objective task_type it completes
+_OBJECTIVE_TYPE_MAP = {
+    "commanderKilled": "defend_hq",
+    "commanderCaptured": "defend_hq",
+    "hvtEliminated": "defend_hvt",
+    "hvtCaptured": "defend_hvt",
+    "radioTowerDestroyed": "defend_radiotower",
+    "radioTowerNeutralized": "defend_radiotower",
+    "gpsJammerDestroyed": "defend_gps_jammer",
+    "gpsJammerDisabled": "defend_gps_jammer",
+    "supplyDepotCaptured": "defend_supply_depot",
+    "mortarPitNeutralized": "defend_mortar_pit",
+    "aaSiteDestroyed": "defend_aa_site",
+    "hmgTowerNeutralized": "defend_hmg_tower"
+}
+
+# Command -> (accepted params types, error) checked before dispatch, for
+# commands whose only up-front requirement is the params container type
+_PARAM_TYPES = {
+    "commanderAllies": (list, "Sides must be an array"),
+    "commanderSides": (list, "Sides must be an array"),
+    "setLLMConfig": (dict, "LLM config must be a hashmap/dictionary"),
+    "commanderGuardrails": (dict, "Guardrails must be a hashmap/dictionary"),
+    "commanderControlGroups": ((list, tuple, set), "Control groups must be an array of group ids"),
+    "commanderSetHVT": (dict, "HVT params must be a hashmap"),
+    "setThinkingConfig": (dict, "Thinking config must be a hashmap/dict"),
+}
+
+# (substring, completion method) checked in order against the event type
+_COMPLETION_METHOD_MATCHES = (
+    ("Captured", "captured"),
+    ("Killed", "killed"),
+    ("Eliminated", "killed"),
+    ("Destroyed", "destroyed"),
+    ("Disabled", "disabled"),
+    ("Neutralized", "neutralized"),
+)
+
+
+def _match_completion_method(event_type: str) -> str:
+    """Infer completion method from the verb in an event type"""
+    for substring, method in _COMPLETION_METHOD_MATCHES:
+        if substring in event_type:
+            return method
+    return "completed"
+
+
+# Completion methods of the known event types, resolved once
+_EVENT_COMPLETION_METHODS = {event: _match_completion_method(event) for event in _OBJECTIVE_TYPE_MAP}
+
+# LLM client prompt-cache attributes reset by emergencyStop
+_LLM_CLIENT_CACHE_ATTRS = ('_cached_system_prompt', '_cached_system_prompt_hash', '_prompt_cache_key')
+
+# deployCommander responses, handed out as copies
+_DEPLOYED_OK = {"status": "ok", "message": "Commander deployed - AI is now active"}
+_UNDEPLOYED_OK = {"status": "ok", "message": "Commander undeployed - AI is now inactive"}
+
+# toggleThinking overrides for update_ai_config, which copies its input
+_THINKING_CONFIG = {True: {"thinking_enabled": True}, False: {"thinking_enabled": False}}
+
 
 class AdminCommandHandler:
     """
@@ -22,6 +118,31 @@ class AdminCommandHandler:
         self.state = state_manager
         self.commander = commander  # Reference to batcom for token stats
         self.guardrails_path = guardrails_path
+        # ((path, mtime_ns), templates) as of the last guardrails read or write
+        self._templates_cache = None
+        # (mission intent text, coordinates parsed from it)
+        self._intent_coords = (None, None)
+        # Command -> handler called as handler(params, flag)
+        self._dispatch = {
+            "commanderBrief": self._handle_mission_init,
+            "commanderAllies": lambda params, flag: self._handle_ai_friends_with(params),
+            "commanderSides": lambda params, flag: self._handle_ai_control_side(params),
+            "setGeminiApiKey": lambda params, flag: self._handle_set_gemini_api_key(params),
+            "setLLMApiKey": lambda params, flag: self._handle_set_llm_api_key(params),
+            "setLLMConfig": lambda params, flag: self._handle_set_llm_config(params),
+            "deployCommander": lambda params, flag: self._handle_deploy_commander(flag),
+            "commanderTask": lambda params, flag: self._handle_mission_objective(params),
+            "getTokenStats": lambda params, flag: self._handle_get_token_stats(),
+            "commanderGuardrails": lambda params, flag: self._handle_guardrails(params),
+            "commanderControlGroups": lambda params, flag: self._handle_control_groups(params),
+            "commanderStartAO": lambda params, flag: self._handle_start_ao(params),
+            "commanderEndAO": lambda params, flag: self._handle_end_ao(),
+            "commanderSetHVT": lambda params, flag: self._handle_set_hvt(params),
+            "aoProgress": lambda params, flag: self._handle_ao_progress(params),
+            "setThinkingConfig": lambda params, flag: self._handle_set_thinking_config(params),
+            "toggleThinking": lambda params, flag: self._handle_toggle_thinking(flag),
+            "emergencyStop": lambda params, flag: self._handle_emergency_stop(),
+        }
 
     def handle_command(self, command: str, params: Any, flag: bool) -> Dict[str, Any]:
         """
@@ -38,48 +159,19 @@ class AdminCommandHandler:
         logger.info('Admin command received: %s', command)
 
         try:
-            if command == "commanderBrief":
-                return self._handle_mission_init(params, flag)
-            elif command == "commanderAllies":
-                return self._handle_ai_friends_with(params)
-            elif command == "commanderSides":
-                return self._handle_ai_control_side(params)
-            elif command == "setGeminiApiKey":
-                return self._handle_set_gemini_api_key(params)
-            elif command == "setLLMApiKey":
-                return self._handle_set_llm_api_key(params)
-            elif command == "setLLMConfig":
-                return self._handle_set_llm_config(params)
-            elif command == "deployCommander":
-                return self._handle_deploy_commander(flag)
-            elif command == "commanderTask":
-                return self._handle_mission_objective(params)
-            elif command == "getTokenStats":
-                return self._handle_get_token_stats()
-            elif command == "commanderGuardrails":
-                return self._handle_guardrails(params)
-            elif command == "commanderControlGroups":
-                return self._handle_control_groups(params)
-            elif command == "commanderStartAO":
-                return self._handle_start_ao(params)
-            elif command == "commanderEndAO":
-                return self._handle_end_ao()
-            elif command == "commanderSetHVT":
-                return self._handle_set_hvt(params)
-            elif command == "aoProgress":
-                return self._handle_ao_progress(params)
-            elif command == "setThinkingConfig":
-                return self._handle_set_thinking_config(params)
-            elif command == "toggleThinking":
-                return self._handle_toggle_thinking(flag)
-            elif command == "emergencyStop":
-                return self._handle_emergency_stop()
-            else:
+            handler = self._dispatch.get(command) if isinstance(command, str) else None
+            if handler is None:
                 return {
                     "status": "error",
                     "error": f"Unknown command: {command}"
                 }
 
+            param_types = _PARAM_TYPES.get(command)
+            if param_types is not None and not isinstance(params, param_types[0]):
+                return {"status": "error", "error": param_types[1]}
+
+            return handler(params, flag)
+
         except Exception as e:
             logger.exception('Error handling admin command: %s', command)
             return {
@@ -103,13 +195,7 @@ class AdminCommandHandler:
         }
 
     def _handle_ai_friends_with(self, sides: list) -> Dict[str, Any]:
-        """Handle commanderAllies command"""
-        if not isinstance(sides, list):
-            return {
-                "status": "error",
-                "error": "Sides must be an array"
-            }
-
+        """Handle commanderAllies command (params type checked by handle_command)"""
         self.state.set_friendly_sides(sides)
 
         return {
@@ -118,13 +204,7 @@ class AdminCommandHandler:
         }
 
     def _handle_ai_control_side(self, sides: list) -> Dict[str, Any]:
-        """Handle commanderSides command"""
-        if not isinstance(sides, list):
-            return {
-                "status": "error",
-                "error": "Sides must be an array"
-            }
-
+        """Handle commanderSides command (params type checked by handle_command)"""
         self.state.set_controlled_sides(sides)
 
         return {
@@ -174,13 +254,7 @@ class AdminCommandHandler:
         }
 
     def _handle_set_llm_config(self, params: Any) -> Dict[str, Any]:
-        """Handle setLLMConfig command - params should be a dict/hashmap"""
-        if not isinstance(params, dict):
-            return {
-                "status": "error",
-                "error": "LLM config must be a hashmap/dictionary"
-            }
-
+        """Handle setLLMConfig command - params is a dict/hashmap (checked by handle_command)"""
         try:
             self.state.update_ai_config(params)
             self._persist_llm_config()
@@ -208,17 +282,11 @@ class AdminCommandHandler:
 
             self.state.deploy()
 
-            return {
-                "status": "ok",
-                "message": "Commander deployed - AI is now active"
-            }
+            return _DEPLOYED_OK.copy()
         else:
             self.state.undeploy()
 
-            return {
-                "status": "ok",
-                "message": "Commander undeployed - AI is now inactive"
-            }
+            return _UNDEPLOYED_OK.copy()
 
     def _persist_llm_config(self):
         """Persist current runtime AI config to guardrails file (including API key)"""
@@ -238,28 +306,74 @@ class AdminCommandHandler:
                     current["api_key"] = key_entry["key"]
 
             # Preserve existing templates from file
-            templates = {}
-            try:
-                with open(self.guardrails_path, "r", encoding="utf-8") as f:
-                    existing = json.load(f)
-                    if isinstance(existing, dict):
-                        templates = existing.get("templates", {})
-            except FileNotFoundError:
-                templates = {}
-            except Exception as read_err:
-                logger.warning("Failed reading guardrails for templates: %s", read_err)
+            templates = self._read_guardrails_templates()
 
             data = {
                 "current": current,
                 "templates": templates
             }
 
-            with open(self.guardrails_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, sort_keys=True)
+            # Encode up front so the file gets one write instead of one per token
+            payload = json.dumps(data, indent=2, sort_keys=True)
+            # Write a sibling temp file and swap it in, so a crash mid-write
+            # never leaves a truncated guardrails file behind
+            tmp_path = self.guardrails_path + ".tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.guardrails_path)
+            except Exception:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            # Our own write must not force a re-read on the next persist
+            self._templates_cache = ((self.guardrails_path, os.stat(self.guardrails_path).st_mtime_ns), templates)
             logger.info("Persisted LLM config (provider=%s) to %s", provider, self.guardrails_path)
         except Exception as e:
             logger.warning("Failed to persist LLM config to %s: %s", self.guardrails_path, e)
 
+    def _read_guardrails_templates(self) -> Any:
+        """
+        Get the "templates" section of the guardrails file
+
+        The file is only parsed again when its mtime differs from the last
+        read or write.
+
+        Returns:
+            Templates from the file, or {} if it is missing or unreadable
+        """
+        path = self.guardrails_path
+        try:
+            key = (path, os.stat(path).st_mtime_ns)
+            cached = self._templates_cache
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+            with open(path, "rb") as f:
+                existing = json.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except Exception as read_err:
+            logger.warning("Failed reading guardrails for templates: %s", read_err)
+            return {}
+
+        templates = existing.get("templates", {}) if isinstance(existing, dict) else {}
+        self._templates_cache = (key, templates)
+        return templates
+
+    def _mission_intent_coords(self) -> Optional[List[float]]:
+        """Coordinates parsed from the current mission intent, reparsed only when it changes"""
+        intent = self.state.mission_intent
+        cached_intent, coords = self._intent_coords
+        if intent != cached_intent:
+            coords = _parse_coords(intent)
+            self._intent_coords = (intent, coords)
+        return coords
+
     def _handle_mission_objective(self, params: Any) -> Dict[str, Any]:
         """
         Handle commanderTask command - supports both legacy array format and new hashmap format
@@ -316,36 +430,23 @@ class AdminCommandHandler:
                 "error": "Objective description must be a non-empty string"
             }
 
+        # Normalize optional fields once
+        if not isinstance(position, list):
+            position = []
+        if not isinstance(unit_classes, list):
+            unit_classes = []
+        if not isinstance(radius, (int, float)):
+            radius = 0
+
         # Attempt to parse coordinates from description if no position provided
-        if (not position or not isinstance(position, list)) and isinstance(description, str):
-            import re
-            match = re.search(r'\[([0-9\.\-,\s]+)\]', description)
-            if match:
-                try:
-                    parts = match.group(1).split(',')
-                    if len(parts) >= 2:
-                        nums = [float(p) for p in parts]
-                        # pad to 3 values
-                        while len(nums) < 3:
-                            nums.append(0.0)
-                        position = nums[:3]
-                except Exception:
-                    pass
+        if not position:
+            position = _parse_coords(description) or position
 
         # If still no position, try mission intent text
-        if (not position or not isinstance(position, list)) and isinstance(self.state.mission_intent, str):
-            import re
-            match = re.search(r'\[([0-9\.\-,\s]+)\]', self.state.mission_intent)
-            if match:
-                try:
-                    parts = match.group(1).split(',')
-                    if len(parts) >= 2:
-                        nums = [float(p) for p in parts]
-                        while len(nums) < 3:
-                            nums.append(0.0)
-                        position = nums[:3]
-                except Exception:
-                    pass
+        if not position and isinstance(self.state.mission_intent, str):
+            intent_coords = self._mission_intent_coords()
+            if intent_coords:
+                position = list(intent_coords)
 
         # Create objective
         obj_id = f"OBJ_RUNTIME_{len(self.state.objectives) + 1}"
@@ -354,9 +455,9 @@ class AdminCommandHandler:
             type=ObjectiveType.CUSTOM,
             description=description,
             priority=priority,
-            unit_classes=unit_classes if isinstance(unit_classes, list) else [],
-            position=position if isinstance(position, list) else [],
-            radius=radius if isinstance(radius, (int, float)) else 0,
+            unit_classes=unit_classes,
+            position=position,
+            radius=radius,
             state=ObjectiveState.PENDING,
             metadata=metadata
         )
@@ -376,18 +477,19 @@ class AdminCommandHandler:
                 "error": "Commander not initialized"
             }
 
-        if not hasattr(self.commander, 'token_tracker'):
+        token_tracker = getattr(self.commander, 'token_tracker', None)
+        if token_tracker is None:
             return {
                 "status": "error",
                 "error": "Token tracker not available"
             }
 
         try:
-            stats = self.commander.token_tracker.get_stats()
+            stats = token_tracker.get_stats()
 
-            # Log formatted stats to console
-            formatted_stats = self.commander.token_tracker.get_stats_formatted()
-            logger.info("\n" + formatted_stats)
+            # Log formatted stats to console (only built when INFO is on)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("\n%s", token_tracker.get_stats_formatted(stats))
 
             return {
                 "status": "ok",
@@ -404,9 +506,6 @@ class AdminCommandHandler:
 
     def _handle_guardrails(self, params: Any) -> Dict[str, Any]:
         """Handle commanderGuardrails (AO bounds and resource pool)"""
-        if not isinstance(params, dict):
-            return {"status": "error", "error": "Guardrails must be a hashmap/dictionary"}
-
         ao = params.get("ao_bounds") or params.get("ao") or params.get("bounds")
         resources = params.get("resources") or params.get("resource_pool")
 
@@ -431,18 +530,16 @@ class AdminCommandHandler:
 
     def _handle_control_groups(self, params: Any) -> Dict[str, Any]:
         """Handle commanderControlGroups to mark specific groups as controllable"""
-        if not isinstance(params, (list, tuple, set)):
-            return {"status": "error", "error": "Control groups must be an array of group ids"}
-
         try:
-            group_ids = [str(g) for g in params]
+            # SQF group ids normally arrive as strings already; only convert the rest
+            group_ids = [g if type(g) is str else str(g) for g in params]
             self.state.set_controlled_group_overrides(group_ids)
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
         return {
             "status": "ok",
-            "message": f"Control overrides updated ({len(params)} groups)"
+            "message": f"Control overrides updated ({len(group_ids)} groups)"
         }
 
     def _handle_start_ao(self, params) -> Dict[str, Any]:
@@ -460,8 +557,8 @@ class AdminCommandHandler:
             full_mission_name = params.get('mission_name', 'unknown')
 
             # Extract just the mission name without the map suffix (e.g., "apex_jsoc_mission" from "apex_jsoc_mission.Altis")
-            if isinstance(full_mission_name, str) and '.' in full_mission_name:
-                mission_name = full_mission_name.split('.')[0]
+            if isinstance(full_mission_name, str):
+                mission_name = full_mission_name.partition('.')[0]
             else:
                 mission_name = full_mission_name
         else:
@@ -471,11 +568,8 @@ class AdminCommandHandler:
             return {"status": "error", "error": "AO ID must be a non-empty string"}
 
         # Extract AO number from ao_id if it contains a number
-        import re
-        ao_number = 0
-        ao_num_match = re.search(r'(\d+)', ao_id)
-        if ao_num_match:
-            ao_number = int(ao_num_match.group(1))
+        ao_num_match = _AO_NUM_RE.search(ao_id)
+        ao_number = int(ao_num_match.group()) if ao_num_match else 0
 
         # Start AO tracking in state manager
         self.state.start_ao(ao_id, map_name, mission_name, ao_number)
@@ -517,16 +611,10 @@ class AdminCommandHandler:
 
     def _handle_set_hvt(self, params: Any) -> Dict[str, Any]:
         """Handle commanderSetHVT - manually designate HVTs"""
-        if not isinstance(params, dict):
-            return {"status": "error", "error": "HVT params must be a hashmap"}
-
         player_uids = params.get("players", [])
         group_ids = params.get("groups", [])
 
         # Store HVT designations (to be applied to next world scan)
-        if not hasattr(self.state, 'hvt_designations'):
-            self.state.hvt_designations = {}
-
         self.state.hvt_designations = {
             "players": player_uids,
             "groups": group_ids
@@ -564,8 +652,9 @@ class AdminCommandHandler:
             event_type = params.get("event", "")
             player_uid = params.get("player", "")
             objective_id = params.get("objective", event_type)
-            objective_type = params.get("type", self._infer_objective_type(event_type))
-            completion_method = params.get("method", self._infer_completion_method(event_type))
+            # Only infer what the caller did not supply
+            objective_type = params["type"] if "type" in params else self._infer_objective_type(event_type)
+            completion_method = params["method"] if "method" in params else self._infer_completion_method(event_type)
             nearby_players_data = params.get("nearby", [])
         # Handle list format
         elif isinstance(params, list):
@@ -589,19 +678,18 @@ class AdminCommandHandler:
         # Get player info from current world state
         player_name = "Unknown"
         group_id = "Unknown"
-        if hasattr(self.state, 'world_state') and self.state.world_state:
-            for player in self.state.world_state.players:
-                if player.uid == player_uid:
-                    player_name = player.name
-                    group_id = player.group_id
-                    break
+        world_state = self.state.world_state
+        if world_state:
+            player = world_state.get_player_by_uid(player_uid)
+            if player is not None:
+                player_name = player.name
+                group_id = player.group_id
 
         # Process nearby players (format: [[uid, name, group_id], ...])
         nearby_players = []
         if nearby_players_data and isinstance(nearby_players_data, list):
-            for nearby in nearby_players_data:
-                if isinstance(nearby, list) and len(nearby) >= 3:
-                    nearby_players.append([nearby[0], nearby[1], nearby[2]])
+            nearby_players = [nearby[:3] for nearby in nearby_players_data
+                              if isinstance(nearby, list) and len(nearby) >= 3]
 
         # Record the completion
         tracker = self.state.effectiveness_tracker
@@ -623,35 +711,15 @@ class AdminCommandHandler:
 
     def _infer_objective_type(self, event_type: str) -> str:
         """Infer objective type from event type"""
-        mapping = {
-            "commanderKilled": "defend_hq",
-            "commanderCaptured": "defend_hq",
-            "hvtEliminated": "defend_hvt",
-            "hvtCaptured": "defend_hvt",
-            "radioTowerDestroyed": "defend_radiotower",
-            "radioTowerNeutralized": "defend_radiotower",
-            "gpsJammerDestroyed": "defend_gps_jammer",
-            "gpsJammerDisabled": "defend_gps_jammer",
-            "supplyDepotCaptured": "defend_supply_depot",
-            "mortarPitNeutralized": "defend_mortar_pit",
-            "aaSiteDestroyed": "defend_aa_site",
-            "hmgTowerNeutralized": "defend_hmg_tower"
-        }
-        return mapping.get(event_type, "unknown")
+        return _OBJECTIVE_TYPE_MAP.get(event_type, "unknown")
 
     def _infer_completion_method(self, event_type: str) -> str:
         """Infer completion method from event type"""
-        if "Captured" in event_type:
-            return "captured"
-        elif "Killed" in event_type or "Eliminated" in event_type:
-            return "killed"
-        elif "Destroyed" in event_type:
-            return "destroyed"
-        elif "Disabled" in event_type:
-            return "disabled"
-        elif "Neutralized" in event_type:
-            return "neutralized"
-        return "completed"
+        if isinstance(event_type, str):
+            method = _EVENT_COMPLETION_METHODS.get(event_type)
+            if method is not None:
+                return method
+        return _match_completion_method(event_type)
 
     def _handle_set_thinking_config(self, params: Any) -> Dict[str, Any]:
         """
@@ -670,11 +738,6 @@ class AdminCommandHandler:
             "log_thoughts_to_file": true/false
         }
         """
-        if not isinstance(params, dict):
-            return {
-                "status": "error",
-                "error": "Thinking config must be a hashmap/dict"
-            }
 
         # Validate thinking mode if provided
         if 'mode' in params:
@@ -732,8 +795,11 @@ class AdminCommandHandler:
         Args:
             enabled: True to enable thinking, False to disable
         """
+        # SQF may send 0/1 as well as true/false
+        enabled = bool(enabled)
+
         # Update state
-        self.state.update_ai_config({'thinking_enabled': enabled})
+        self.state.update_ai_config(_THINKING_CONFIG[enabled])
 
         # Persist to guardrails.json
         self._persist_llm_config()
@@ -786,23 +852,21 @@ class AdminCommandHandler:
                 logger.warning("Cleared order history and summaries")
 
                 # 3. Clear LLM client caches
-                if self.commander.llm_client:
+                llm_client = self.commander.llm_client
+                if llm_client:
                     # Clear OpenAI conversation state
-                    if hasattr(self.commander.llm_client, '_cached_system_prompt'):
-                        self.commander.llm_client._cached_system_prompt = None
-                    if hasattr(self.commander.llm_client, '_cached_system_prompt_hash'):
-                        self.commander.llm_client._cached_system_prompt_hash = None
-                    if hasattr(self.commander.llm_client, '_prompt_cache_key'):
-                        self.commander.llm_client._prompt_cache_key = None
+                    for attr in _LLM_CLIENT_CACHE_ATTRS:
+                        if hasattr(llm_client, attr):
+                            setattr(llm_client, attr, None)
                     logger.warning("Cleared LLM client caches")
 
                     # Clear Gemini caches if present
-                    if hasattr(self.commander.llm_client, 'delete_all_caches'):
+                    if hasattr(llm_client, 'delete_all_caches'):
                         try:
-                            self.commander.llm_client.delete_all_caches()
+                            llm_client.delete_all_caches()
                             logger.warning("Deleted all Gemini caches")
                         except Exception as e:
-                            logger.warning(f"Failed to delete Gemini caches: {e}")
+                            logger.warning("Failed to delete Gemini caches: %s", e)
 
                 # 4. Reset cached context tracking
                 self.commander.last_cached_objectives = None
@@ -833,7 +897,7 @@ class AdminCommandHandler:
             }
 
         except Exception as e:
-            logger.error(f"Error during emergency stop: {e}", exc_info=True)
+            logger.error("Error during emergency stop: %s", e, exc_info=True)
             return {
                 "status": "error",
                 "error": f"Emergency stop failed: {str(e)}",
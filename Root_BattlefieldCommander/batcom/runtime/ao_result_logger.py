@@ -8,11 +8,41 @@ and outcomes to a dedicated log file for historical analysis and learning.
 import os
 import json
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
 
 logger = logging.getLogger('batcom.runtime.ao_result_logger')
 
+# Section rules in the AO result log
+_RULE = '=' * 80 + '\n'
+_DIVIDER = '-' * 80 + '\n'
+
+# Most recent entries kept per AO; older ones are dropped
+_MAX_DECISION_CYCLES = 10000
+_MAX_DAMAGE_HOTSPOTS = 5000
+
+
+def _top_contributor(contributions: Dict[str, Dict[str, Any]]):
+    """
+    Find the highest scoring entry (kills + 5 per objective secured)
+
+    Args:
+        contributions: Non-empty id -> {'kills': N, 'objectives_secured': [...]} map
+
+    Returns:
+        (id, contribution, objectives secured count, score); the first entry wins ties
+    """
+    best = None
+    best_score = 0
+    for contrib_id, contrib in contributions.items():
+        objectives = len(contrib['objectives_secured'])
+        score = contrib['kills'] + objectives * 5
+        if best is None or score > best_score:
+            best = (contrib_id, contrib, objectives, score)
+            best_score = score
+    return best
+
 
 class AOResultLogger:
     """
@@ -30,26 +60,33 @@ class AOResultLogger:
         self.log_dir = os.path.join(log_dir, "llm_calls")
         self.current_ao_file: Optional[str] = None
         self.current_ao_data: Dict[str, Any] = {}
+        # True between start_ao and a successful finalize_ao
+        self._active = False
+        # Objective ids already in objective_engagement_order
+        self._engaged_objective_ids: Set[str] = set()
+        # Sum of order_count over recorded decision cycles
+        self._total_orders = 0
+        # Decision cycles recorded, including any the capped buffer dropped
+        self._total_cycles = 0
 
         # Ensure log directory exists with fallback for Linux compatibility
-        if not os.path.exists(self.log_dir):
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            logger.info(f'AO result log directory: {self.log_dir}')
+        except (OSError, PermissionError) as e:
+            # Fallback to simpler path if @BATCOM fails (Linux compatibility)
+            logger.warning(f'Failed to create AO result log directory {self.log_dir}: {e}')
             try:
+                fallback_dir = os.path.join(os.getcwd(), "batcom_logs", "llm_calls")
+                self.log_dir = fallback_dir
                 os.makedirs(self.log_dir, exist_ok=True)
-                logger.info(f'Created AO result log directory: {self.log_dir}')
-            except (OSError, PermissionError) as e:
-                # Fallback to simpler path if @BATCOM fails (Linux compatibility)
-                logger.warning(f'Failed to create AO result log directory {self.log_dir}: {e}')
-                try:
-                    fallback_dir = os.path.join(os.getcwd(), "batcom_logs", "llm_calls")
-                    self.log_dir = fallback_dir
-                    os.makedirs(self.log_dir, exist_ok=True)
-                    logger.info(f'Using fallback AO log directory: {self.log_dir}')
-                except Exception as fallback_error:
-                    # Last resort: temp directory
-                    import tempfile
-                    self.log_dir = os.path.join(tempfile.gettempdir(), "batcom_logs", "llm_calls")
-                    os.makedirs(self.log_dir, exist_ok=True)
-                    logger.info(f'Using temp AO log directory: {self.log_dir}')
+                logger.info(f'Using fallback AO log directory: {self.log_dir}')
+            except Exception as fallback_error:
+                # Last resort: temp directory
+                import tempfile
+                self.log_dir = os.path.join(tempfile.gettempdir(), "batcom_logs", "llm_calls")
+                os.makedirs(self.log_dir, exist_ok=True)
+                logger.info(f'Using temp AO log directory: {self.log_dir}')
 
     def start_ao(self, ao_id: str, ao_number: int, map_name: str, mission_name: str):
         """
@@ -62,7 +99,8 @@ class AOResultLogger:
             mission_name: Mission name
         """
         # Generate filename: aoresult.<aonumber>.<mapname>.<missionname>.<timestamp>.log
-        timestamp = datetime.now().strftime('%Y_%m_%d_%H_%M_%S')
+        now = datetime.now()
+        timestamp = now.strftime('%Y_%m_%d_%H_%M_%S')
         filename = f'aoresult.{ao_number}.{map_name}.{mission_name}.{timestamp}.log'
         self.current_ao_file = os.path.join(self.log_dir, filename)
 
@@ -72,20 +110,20 @@ class AOResultLogger:
             'ao_number': ao_number,
             'map_name': map_name,
             'mission_name': mission_name,
-            'start_time': datetime.now().isoformat(),
-            'start_timestamp': datetime.now().timestamp(),
+            'start_time': now.isoformat(),
+            'start_timestamp': now.timestamp(),
             'objectives': [],
-            'decision_cycles': [],
+            'decision_cycles': deque(maxlen=_MAX_DECISION_CYCLES),
             'initial_forces': {},
             'final_forces': {},
-            'threat_levels': [],
+            'threat_levels': [],  # Filled from decision_cycles in finalize_ao
             'deployed_assets': [],
             'outcome': 'UNKNOWN',
             'lessons_learned': [],
             # Tactical analysis
             'first_objective_targeted': None,
             'first_objective_lost': None,
-            'damage_hotspots': [],  # Areas where most enemy casualties occurred
+            'damage_hotspots': deque(maxlen=_MAX_DAMAGE_HOTSPOTS),  # Areas where most enemy casualties occurred
             'longest_fight_location': None,
             'fight_durations': {},  # objective_id -> duration_seconds
             'objective_engagement_order': [],  # Chronological order of objective engagements
@@ -97,13 +135,18 @@ class AOResultLogger:
             'squad_contributions': {}  # squad_id -> {'kills': N, 'objectives_secured': [...]}
         }
 
+        self._engaged_objective_ids = set()
+        self._total_orders = 0
+        self._total_cycles = 0
+        self._active = True
+
         logger.info(f'AO result logging started: {filename}')
 
     def record_initial_forces(self, controlled_groups: int, controlled_units: int,
                              allied_groups: int, allied_units: int,
                              enemy_groups: int, enemy_units: int):
         """Record initial force composition"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
         self.current_ao_data['initial_forces'] = {
@@ -119,7 +162,7 @@ class AOResultLogger:
     def record_objective(self, obj_id: str, description: str, priority: int,
                         position: List[float] = None, task_type: str = None):
         """Record an objective"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
         obj_entry = {
@@ -137,12 +180,13 @@ class AOResultLogger:
                             commentary: str, threat_level: str,
                             current_forces: Dict[str, int]):
         """Record a decision cycle"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
+        mission_time = round(mission_time, 1)
         cycle_entry = {
             'cycle': cycle,
-            'mission_time': round(mission_time, 1),
+            'mission_time': mission_time,
             'timestamp': datetime.now().isoformat(),
             'order_count': order_count,
             'order_summary': order_summary,
@@ -151,18 +195,13 @@ class AOResultLogger:
             'forces_at_cycle': current_forces
         }
         self.current_ao_data['decision_cycles'].append(cycle_entry)
-
-        # Track threat levels over time
-        self.current_ao_data['threat_levels'].append({
-            'cycle': cycle,
-            'mission_time': round(mission_time, 1),
-            'level': threat_level
-        })
+        self._total_orders += order_count
+        self._total_cycles += 1
 
     def record_deployed_asset(self, cycle: int, mission_time: float,
                              side: str, asset_type: str, position: List[float]):
         """Record an asset deployment"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
         self.current_ao_data['deployed_assets'].append({
@@ -177,7 +216,7 @@ class AOResultLogger:
                           allied_groups: int, allied_units: int,
                           enemy_groups: int, enemy_units: int):
         """Record final force composition"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
         self.current_ao_data['final_forces'] = {
@@ -208,7 +247,7 @@ class AOResultLogger:
 
     def record_outcome(self, outcome: str, objectives_completed: int, objectives_total: int):
         """Record AO outcome"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
         self.current_ao_data['outcome'] = outcome
@@ -218,7 +257,7 @@ class AOResultLogger:
 
     def add_lesson_learned(self, lesson: str):
         """Add a lesson learned from this AO"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
         self.current_ao_data['lessons_learned'].append({
@@ -228,50 +267,55 @@ class AOResultLogger:
 
     def record_objective_engagement(self, obj_id: str, cycle: int, mission_time: float):
         """Record when an objective was first engaged/targeted"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
+        mission_time = round(mission_time, 1)
+
         # Track first objective targeted
         if not self.current_ao_data['first_objective_targeted']:
             self.current_ao_data['first_objective_targeted'] = {
                 'objective_id': obj_id,
                 'cycle': cycle,
-                'mission_time': round(mission_time, 1)
+                'mission_time': mission_time
             }
 
         # Add to engagement order if not already recorded
-        if obj_id not in [e['objective_id'] for e in self.current_ao_data['objective_engagement_order']]:
+        if obj_id not in self._engaged_objective_ids:
+            self._engaged_objective_ids.add(obj_id)
             self.current_ao_data['objective_engagement_order'].append({
                 'objective_id': obj_id,
                 'cycle': cycle,
-                'mission_time': round(mission_time, 1),
+                'mission_time': mission_time,
                 'timestamp': datetime.now().isoformat()
             })
 
     def record_objective_lost(self, obj_id: str, cycle: int, mission_time: float):
         """Record when an objective was lost"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
+        mission_time = round(mission_time, 1)
+
         # Track first objective lost
         if not self.current_ao_data['first_objective_lost']:
             self.current_ao_data['first_objective_lost'] = {
                 'objective_id': obj_id,
                 'cycle': cycle,
-                'mission_time': round(mission_time, 1)
+                'mission_time': mission_time
             }
 
         # Add to loss order
         self.current_ao_data['objective_loss_order'].append({
             'objective_id': obj_id,
             'cycle': cycle,
-            'mission_time': round(mission_time, 1),
+            'mission_time': mission_time,
             'timestamp': datetime.now().isoformat()
         })
 
     def record_damage_hotspot(self, position: List[float], enemy_casualties: int, area_description: str = None):
         """Record a damage hotspot where significant enemy casualties occurred"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
         self.current_ao_data['damage_hotspots'].append({
@@ -283,83 +327,86 @@ class AOResultLogger:
 
     def record_fight_duration(self, obj_id: str, duration_seconds: float):
         """Record how long a fight lasted at an objective"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
-        self.current_ao_data['fight_durations'][obj_id] = round(duration_seconds, 1)
+        rounded = round(duration_seconds, 1)
+        self.current_ao_data['fight_durations'][obj_id] = rounded
 
         # Update longest fight location
         current_longest = self.current_ao_data.get('longest_fight_location')
         if not current_longest or duration_seconds > current_longest.get('duration', 0):
             self.current_ao_data['longest_fight_location'] = {
                 'objective_id': obj_id,
-                'duration_seconds': round(duration_seconds, 1)
+                'duration_seconds': rounded
             }
 
     def record_player_contribution(self, player_id: str, player_name: str, kills: int = 0, objective_secured: str = None):
         """Record player contributions for MVP tracking"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
-        if player_id not in self.current_ao_data['player_contributions']:
-            self.current_ao_data['player_contributions'][player_id] = {
+        contributions = self.current_ao_data['player_contributions']
+        contrib = contributions.get(player_id)
+        if contrib is None:
+            contrib = contributions[player_id] = {
                 'name': player_name,
                 'kills': 0,
                 'objectives_secured': []
             }
 
-        contrib = self.current_ao_data['player_contributions'][player_id]
         contrib['kills'] += kills
         if objective_secured and objective_secured not in contrib['objectives_secured']:
             contrib['objectives_secured'].append(objective_secured)
 
     def record_squad_contribution(self, squad_id: str, kills: int = 0, objective_secured: str = None):
         """Record squad contributions for MVP tracking"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
-        if squad_id not in self.current_ao_data['squad_contributions']:
-            self.current_ao_data['squad_contributions'][squad_id] = {
+        contributions = self.current_ao_data['squad_contributions']
+        contrib = contributions.get(squad_id)
+        if contrib is None:
+            contrib = contributions[squad_id] = {
                 'kills': 0,
                 'objectives_secured': []
             }
 
-        contrib = self.current_ao_data['squad_contributions'][squad_id]
         contrib['kills'] += kills
         if objective_secured and objective_secured not in contrib['objectives_secured']:
             contrib['objectives_secured'].append(objective_secured)
 
     def calculate_mvp(self):
         """Calculate MVP player and squad based on contributions"""
-        if not self.current_ao_data:
+        if not self._active:
             return
 
         # Calculate MVP player
         players = self.current_ao_data['player_contributions']
         if players:
-            mvp_player_id = max(players, key=lambda p: players[p]['kills'] + len(players[p]['objectives_secured']) * 5)
+            mvp_player_id, contrib, objectives, score = _top_contributor(players)
             self.current_ao_data['mvp_player'] = {
                 'player_id': mvp_player_id,
-                'name': players[mvp_player_id]['name'],
-                'kills': players[mvp_player_id]['kills'],
-                'objectives_secured': len(players[mvp_player_id]['objectives_secured']),
-                'score': players[mvp_player_id]['kills'] + len(players[mvp_player_id]['objectives_secured']) * 5
+                'name': contrib['name'],
+                'kills': contrib['kills'],
+                'objectives_secured': objectives,
+                'score': score
             }
 
         # Calculate MVP squad
         squads = self.current_ao_data['squad_contributions']
         if squads:
-            mvp_squad_id = max(squads, key=lambda s: squads[s]['kills'] + len(squads[s]['objectives_secured']) * 5)
+            mvp_squad_id, contrib, objectives, score = _top_contributor(squads)
             self.current_ao_data['mvp_squad'] = {
                 'squad_id': mvp_squad_id,
-                'kills': squads[mvp_squad_id]['kills'],
-                'objectives_secured': len(squads[mvp_squad_id]['objectives_secured']),
-                'score': squads[mvp_squad_id]['kills'] + len(squads[mvp_squad_id]['objectives_secured']) * 5
+                'kills': contrib['kills'],
+                'objectives_secured': objectives,
+                'score': score
             }
 
     def finalize_ao(self):
         """Finalize and write AO result log"""
-        if not self.current_ao_file or not self.current_ao_data:
+        if not self.current_ao_file or not self._active:
             logger.warning('No AO data to finalize')
             return None
 
@@ -367,64 +414,95 @@ class AOResultLogger:
         self.calculate_mvp()
 
         # Add end time
-        self.current_ao_data['end_time'] = datetime.now().isoformat()
-        self.current_ao_data['end_timestamp'] = datetime.now().timestamp()
+        now = datetime.now()
+        self.current_ao_data['end_time'] = now.isoformat()
+        self.current_ao_data['end_timestamp'] = now.timestamp()
 
         # Calculate duration
         if 'start_timestamp' in self.current_ao_data:
             duration_seconds = self.current_ao_data['end_timestamp'] - self.current_ao_data['start_timestamp']
             self.current_ao_data['duration_seconds'] = round(duration_seconds, 1)
 
+        # Capped buffers become plain lists for JSON and the next commander
+        self.current_ao_data['decision_cycles'] = list(self.current_ao_data['decision_cycles'])
+        self.current_ao_data['damage_hotspots'] = list(self.current_ao_data['damage_hotspots'])
+        # Oldest cycles (and their threat levels) the cap dropped from the log
+        self.current_ao_data['decision_cycles_truncated'] = (
+            self._total_cycles - len(self.current_ao_data['decision_cycles'])
+        )
+
+        # Threat levels over time, derived from the recorded cycles
+        self.current_ao_data['threat_levels'] = [
+            {'cycle': c['cycle'], 'mission_time': c['mission_time'], 'level': c['threat_level']}
+            for c in self.current_ao_data['decision_cycles']
+        ]
+
         # Write to file
         try:
+            # Header and summary are each written in one call; the JSON
+            # data is streamed between them rather than built as one string
+            data = self.current_ao_data
+            header = [
+                _RULE,
+                f'AO RESULT LOG - {data["ao_id"]}\n',
+                _RULE,
+                f'Map: {data["map_name"]}\n',
+                f'Mission: {data["mission_name"]}\n',
+                f'AO Number: {data["ao_number"]}\n',
+                f'Started: {data["start_time"]}\n',
+                f'Ended: {data["end_time"]}\n',
+                f'Duration: {data.get("duration_seconds", 0):.1f}s\n',
+                f'Outcome: {data["outcome"]}\n',
+                _RULE,
+                '\n',
+                # Complete JSON data for machine parsing
+                'COMPLETE AO DATA (JSON):\n',
+                _DIVIDER,
+            ]
+            parts = [
+                '\n',
+                _DIVIDER,
+                '\n',
+                # Human-readable summary
+                'SUMMARY:\n',
+                _DIVIDER,
+                f'Total Decision Cycles: {self._total_cycles}\n',
+                f'Total Orders Issued: {self._total_orders}\n',
+                f'Assets Deployed: {len(data["deployed_assets"])}\n',
+                f'Objectives: {data.get("objectives_completed", 0)}/{data.get("objectives_total", 0)} completed\n',
+            ]
+
+            if data['decision_cycles_truncated']:
+                parts.append(f'  (oldest {data["decision_cycles_truncated"]} decision cycles dropped; '
+                             f'last {len(data["decision_cycles"])} kept in the JSON data)\n')
+
+            # Skip the casualties block when nothing was lost or destroyed
+            cas = data.get('casualties')
+            if cas and any(cas.values()):
+                parts.append('\nCASUALTIES:\n')
+                parts.append(f'  Friendly losses: {cas["controlled_units_lost"]} controlled, {cas["allied_units_lost"]} allied\n')
+                parts.append(f'  Enemy destroyed: {cas["enemy_units_destroyed"]}\n')
+                parts.append(f'  Loss ratio: {cas["loss_ratio"]:.2f} (enemy/friendly)\n')
+
+            if data['lessons_learned']:
+                parts.append(f'\nLESSONS LEARNED ({len(data["lessons_learned"])}):\n')
+                for i, lesson in enumerate(data['lessons_learned'], 1):
+                    parts.append(f'  {i}. {lesson["lesson"]}\n')
+
+            parts.append(_RULE)
+
             with open(self.current_ao_file, 'w', encoding='utf-8') as f:
-                # Write header
-                f.write('='*80 + '\n')
-                f.write(f'AO RESULT LOG - {self.current_ao_data["ao_id"]}\n')
-                f.write('='*80 + '\n')
-                f.write(f'Map: {self.current_ao_data["map_name"]}\n')
-                f.write(f'Mission: {self.current_ao_data["mission_name"]}\n')
-                f.write(f'AO Number: {self.current_ao_data["ao_number"]}\n')
-                f.write(f'Started: {self.current_ao_data["start_time"]}\n')
-                f.write(f'Ended: {self.current_ao_data["end_time"]}\n')
-                f.write(f'Duration: {self.current_ao_data.get("duration_seconds", 0):.1f}s\n')
-                f.write(f'Outcome: {self.current_ao_data["outcome"]}\n')
-                f.write('='*80 + '\n\n')
-
-                # Write complete JSON data for machine parsing
-                f.write('COMPLETE AO DATA (JSON):\n')
-                f.write('-'*80 + '\n')
-                f.write(json.dumps(self.current_ao_data, indent=2, ensure_ascii=False))
-                f.write('\n' + '-'*80 + '\n\n')
-
-                # Write human-readable summary
-                f.write('SUMMARY:\n')
-                f.write('-'*80 + '\n')
-                f.write(f'Total Decision Cycles: {len(self.current_ao_data["decision_cycles"])}\n')
-                f.write(f'Total Orders Issued: {sum(c["order_count"] for c in self.current_ao_data["decision_cycles"])}\n')
-                f.write(f'Assets Deployed: {len(self.current_ao_data["deployed_assets"])}\n')
-                f.write(f'Objectives: {self.current_ao_data.get("objectives_completed", 0)}/{self.current_ao_data.get("objectives_total", 0)} completed\n')
-
-                if self.current_ao_data.get('casualties'):
-                    cas = self.current_ao_data['casualties']
-                    f.write(f'\nCASUALTIES:\n')
-                    f.write(f'  Friendly losses: {cas["controlled_units_lost"]} controlled, {cas["allied_units_lost"]} allied\n')
-                    f.write(f'  Enemy destroyed: {cas["enemy_units_destroyed"]}\n')
-                    f.write(f'  Loss ratio: {cas["loss_ratio"]:.2f} (enemy/friendly)\n')
-
-                if self.current_ao_data['lessons_learned']:
-                    f.write(f'\nLESSONS LEARNED ({len(self.current_ao_data["lessons_learned"])}):\n')
-                    for i, lesson in enumerate(self.current_ao_data['lessons_learned'], 1):
-                        f.write(f'  {i}. {lesson["lesson"]}\n')
-
-                f.write('='*80 + '\n')
+                f.write(''.join(header))
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write(''.join(parts))
 
             logger.info(f'AO result log finalized: {self.current_ao_file}')
 
-            # Return copy of data for next commander
-            result_data = dict(self.current_ao_data)
+            # Hand the data to the next commander; the logger starts a fresh dict
+            result_data = self.current_ao_data
 
             # Reset state
+            self._active = False
             self.current_ao_file = None
             self.current_ao_data = {}
 
@@ -10,7 +10,7 @@ import hashlib
 import threading
 import json
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from .state import StateManager
 from .token_tracker import TokenTracker
 from .api_logger import AOAPILogger
@@ -99,6 +99,9 @@ class batcom:
         self.llm_result_lock = threading.Lock()  # Thread safety for result cache
         self.llm_thread: Optional[threading.Thread] = None  # Background LLM thread
         self.first_llm_call_completed = False  # Track if we've made at least one successful LLM call
+        self.llm_test_result: Optional[Tuple[bool, str]] = None  # (success, message) from init() connection test
+        self.llm_test_done = threading.Event()  # Cleared while the init() connection test is running
+        self.llm_test_done.set()
 
         # Initialize LLM components
         self.llm_enabled = False
@@ -127,21 +130,24 @@ class batcom:
         Returns:
             Hash string representing the current state
         """
-        # Only hash significant state that should trigger new decisions
-        state_parts = []
+        # Only hash significant state that should trigger new decisions.
+        # Frozensets hash independently of order, so nothing is sorted or
+        # formatted; the key is only compared within this process.
 
         # Group positions and unit counts
-        for group in sorted(world_state.controlled_groups, key=lambda g: g.id):
-            pos = tuple(int(p / 10) * 10 for p in group.position[:2])  # Round to nearest 10m
-            state_parts.append(f"{group.id}:{pos}:{group.unit_count}")
+        groups = frozenset(
+            (group.id, tuple(int(p / 10) * 10 for p in group.position[:2]), group.unit_count)  # Round to nearest 10m
+            for group in world_state.controlled_groups
+        )
 
         # Objective states
-        for obj in sorted(self.state.objectives, key=lambda o: o.id):
-            state_parts.append(f"{obj.id}:{obj.state.value}:{obj.priority}")
+        objectives = frozenset(
+            (obj.id, obj.state.value, obj.priority)
+            for obj in self.state.objectives
+        )
 
         # Create hash
-        state_str = "|".join(state_parts)
-        return hashlib.md5(state_str.encode()).hexdigest()
+        return format(hash((groups, objectives)) & 0xFFFFFFFFFFFFFFFF, '016x')
 
     def process_world_state(self, world_state: WorldState):
         """
@@ -1130,6 +1136,11 @@ You MUST use these EXACT field names. Do NOT use variations or synonyms.
         if not self.llm_enabled or self.llm_circuit_open:
             return None
 
+        # Leave the client to the init() connection test until it finishes
+        if not self.llm_test_done.is_set():
+            logger.debug("LLM connection test still running - using rule-based fallback")
+            return None
+
         # Check if we have a cached result from previous async call
         with self.llm_result_lock:
             if self.llm_result_cache is not None:
@@ -1342,11 +1353,6 @@ You MUST use these EXACT field names. Do NOT use variations or synonyms.
 
         return worldstate_dict
 
-    def _distance_2d(self, pos1, pos2) -> float:
-        """Calculate 2D distance between positions"""
-        import math
-        return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
-
     def _format_previous_ao_intel_for_cache(self, ao_data: Dict[str, Any]) -> str:
         """
         Format previous AO intelligence for cached context (system prompt).
@@ -1541,8 +1547,12 @@ You MUST use these EXACT field names. Do NOT use variations or synonyms.
 
         for obj in objectives:
             if hasattr(obj, 'position') and obj.position:
+                obj_x = obj.position[0]
+                obj_y = obj.position[1]
+                # Enemies within 2x objective radius, compared squared
+                threshold_sq = (getattr(obj, 'radius', 300) * 2) ** 2
                 enemies_at_obj = [g for g in enemy_groups
-                                 if self._distance_2d(g.position, obj.position) < (getattr(obj, 'radius', 300) * 2)]
+                                 if (g.position[0] - obj_x) ** 2 + (g.position[1] - obj_y) ** 2 < threshold_sq]
                 if enemies_at_obj:
                     enemy_near_objectives += sum(g.unit_count for g in enemies_at_obj)
                     objectives_under_threat.append(obj.id)
@@ -1628,7 +1638,7 @@ You MUST use these EXACT field names. Do NOT use variations or synonyms.
             objective_distances = []
             for obj in objectives:
                 if hasattr(obj, 'position') and obj.position:
-                    dist = math.sqrt((group.position[0] - obj.position[0])**2 + (group.position[1] - obj.position[1])**2)
+                    dist = math.hypot(group.position[0] - obj.position[0], group.position[1] - obj.position[1])
                     objective_distances.append({
                         'objective_id': obj.id,
                         'distance_m': round(dist)
@@ -1643,7 +1653,7 @@ You MUST use these EXACT field names. Do NOT use variations or synonyms.
             nearest_enemy = None
             min_dist = float('inf')
             for enemy in enemy_groups:
-                dist = math.sqrt((group.position[0] - enemy.position[0])**2 + (group.position[1] - enemy.position[1])**2)
+                dist = math.hypot(group.position[0] - enemy.position[0], group.position[1] - enemy.position[1])
                 if dist < min_dist:
                     min_dist = dist
                     nearest_enemy = {'id': enemy.id, 'distance_m': round(dist), 'type': getattr(enemy, 'type', 'unknown')}
@@ -1655,7 +1665,7 @@ You MUST use these EXACT field names. Do NOT use variations or synonyms.
             nearest_friendly = None
             min_dist = float('inf')
             for friendly in friendly_groups:
-                dist = math.sqrt((group.position[0] - friendly.position[0])**2 + (group.position[1] - friendly.position[1])**2)
+                dist = math.hypot(group.position[0] - friendly.position[0], group.position[1] - friendly.position[1])
                 if dist < min_dist:
                     min_dist = dist
                     nearest_friendly = {'id': friendly.id, 'distance_m': round(dist), 'type': getattr(friendly, 'type', 'unknown')}
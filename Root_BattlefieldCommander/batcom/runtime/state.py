@@ -8,6 +8,7 @@ import logging
 import time
 from typing import List, Dict, Any, Optional
 from ..models.objectives import Objective
+from ..models.world import WorldState
 from ..tracking.effectiveness import EffectivenessTracker
 from ..learning.ao_analyzer import AOAnalyzer
 from .ao_result_logger import AOResultLogger
@@ -30,6 +31,10 @@ class StateManager:
         self.ao_bounds: Dict[str, Any] = {}
         self.resource_pool: Dict[str, Dict[str, Any]] = {}
         self.resource_usage: Dict[str, Dict[str, int]] = {}
+        # Bumped whenever the resource pool is replaced (lets readers cache templates)
+        self.resource_version: int = 0
+        # Bumped whenever resource_usage changes (pool replaced or asset reserved)
+        self.resource_usage_version: int = 0
         self.controlled_group_overrides = set()
         self.key_assets: Dict[str, Any] = {}
         # Provider -> data (key, endpoint, deployment, etc.)
@@ -38,6 +43,10 @@ class StateManager:
         self.runtime_ai_config: Dict[str, Any] = {}
         # AO Defense Phase (when entire AO switches to defense mode, e.g., counterattack)
         self.ao_defense_active: bool = False
+        # Manual HVT designations from commanderSetHVT ({"players": [...], "groups": [...]})
+        self.hvt_designations: Dict[str, Any] = {}
+        # Latest world snapshot, used by admin handlers to resolve player UIDs
+        self.world_state: Optional[WorldState] = None
 
         # NEW: AO tracking
         self.effectiveness_tracker = EffectivenessTracker()
@@ -196,8 +205,28 @@ class StateManager:
             raise ValueError("Resource pool must be a dictionary")
         self.resource_pool = pool
         self.resource_usage = {side: {} for side in pool.keys()}
+        self.resource_version += 1
+        self.resource_usage_version += 1
         logger.info("Resource pool configured for sides: %s", list(pool.keys()))
 
+    def clear_side(self, side: str) -> bool:
+        """
+        Remove a side's assets and usage from the resource pool in place
+
+        Args:
+            side: Upper-case side name
+
+        Returns:
+            True if the side had a resource pool entry
+        """
+        if side not in self.resource_pool:
+            return False
+        del self.resource_pool[side]
+        self.resource_usage.pop(side, None)
+        self.resource_version += 1
+        self.resource_usage_version += 1
+        return True
+
     def get_asset_template(self, side: str, asset_type: str) -> Dict[str, Any]:
         """Get asset template definition"""
         side_cfg = self.resource_pool.get(side.upper(), {})
@@ -222,6 +251,7 @@ class StateManager:
         if side_key not in self.resource_usage:
             self.resource_usage[side_key] = {}
         self.resource_usage[side_key][asset_type] = self.resource_usage[side_key].get(asset_type, 0) + amount
+        self.resource_usage_version += 1
         return True
 
     def get_resource_status(self) -> Dict[str, Any]:
@@ -175,14 +175,18 @@ class TokenTracker:
 
         return stats
 
-    def get_stats_formatted(self) -> str:
+    def get_stats_formatted(self, stats: Optional[Dict[str, Any]] = None) -> str:
         """
         Get formatted statistics as a readable string
 
+        Args:
+            stats: Result of get_stats() to format; computed if omitted
+
         Returns:
             Formatted statistics string
         """
-        stats = self.get_stats()
+        if stats is None:
+            stats = self.get_stats()
 
         lines = []
         lines.append("=" * 80)